@@ -1,10 +1,7 @@
-import os
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from dotenv import load_dotenv
 
-# Cargar variables de entorno
-load_dotenv()
+from .config import get_settings
 
 # Configurar el esquema de autenticación
 security = HTTPBearer()
@@ -22,8 +19,8 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     Raises:
         HTTPException: Si el token es inválido o no está presente
     """
-    # Obtener el token del archivo .env o usar un valor por defecto
-    valid_token = os.getenv("API_TOKEN", "test_token_123")
+    # Obtener el token de la configuración (.env o valor por defecto)
+    valid_token = get_settings().api_token
     
     if not credentials:
         raise HTTPException(
@@ -46,4 +43,4 @@ def get_api_token():
     Returns:
         str: El token de la API
     """
-    return os.getenv("API_TOKEN", "test_token_123") 
\ No newline at end of file
+    return get_settings().api_token 
\ No newline at end of file
@@ -0,0 +1,121 @@
+import gzip
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él sólo se usa gzip
+    brotli = None
+
+# Tipos de contenido que merece la pena comprimir
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Elige la codificación a usar según la cabecera Accept-Encoding del cliente.
+
+    Args:
+        accept_encoding: Valor de la cabecera Accept-Encoding
+
+    Returns:
+        Optional[str]: "br", "gzip" o None si el cliente no acepta ninguna
+    """
+    accepted = set()
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        accepted.add(coding.strip())
+
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """
+    Comprime el cuerpo con la codificación indicada ("br" o "gzip").
+    """
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Middleware ASGI que comprime con brotli o gzip las respuestas JSON y de texto.
+
+    Sólo se comprimen las respuestas completas (no streaming) de al menos
+    minimum_size bytes que no traigan ya una Content-Encoding, como las
+    respuestas precalculadas de app.http_cache.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = dict(
+                (name.lower(), value) for name, value in start_message.get("headers", [])
+            )
+            content_type = headers.get(b"content-type", b"").decode("latin-1")
+
+            if (message.get("more_body", False)
+                    or b"content-encoding" in headers
+                    or len(body) < self.minimum_size
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)):
+                # Respuesta en streaming, ya comprimida, pequeña o no comprimible
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            new_headers = [
+                (name, value) for name, value in start_message.get("headers", [])
+                if name.lower() not in (b"content-length", b"vary")
+            ]
+            vary = headers.get(b"vary")
+            new_headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+            new_headers.append((b"content-encoding", encoding.encode()))
+            new_headers.append((b"content-length", str(len(compressed)).encode()))
+
+            await send({**start_message, "headers": new_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,100 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Configuración de la aplicación, leída de las variables de entorno.
+    Se carga una sola vez por proceso mediante get_settings().
+    """
+    api_token: str = "test_token_123"
+    environment: str = "development"
+    host: str = "0.0.0.0"
+    port: int = 8000
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_sample_rate: float = 1.0
+    max_requests_per_minute: int = 20
+    result_store_path: str = "data/results.db"
+    result_store_max_age: int = 86400
+    compression_min_size: int = 1024
+    scraper_max_workers: int = 16
+    streaming_parse: bool = False
+    parse_executor: str = "inline"
+    parse_workers: int = 0
+    webhook_secret: str = ""
+    webhook_queue_size: int = 1000
+    webhook_workers: int = 2
+    webhook_max_attempts: int = 6
+    webhook_backoff_base: float = 1.0
+    webhook_allowed_hosts: Tuple[str, ...] = ()
+    watchlist_enabled: bool = True
+    watchlist_interval: int = 86400
+    watchlist_poll_interval: int = 60
+    watchlist_batch_size: int = 50
+    watchlist_retry_delay: int = 300
+    workers: int = 0
+    keep_alive_timeout: int = 5
+    backlog: int = 2048
+    graceful_shutdown_timeout: int = 30
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """
+        Construye la configuración a partir de las variables de entorno.
+
+        Returns:
+            Settings: Configuración con los valores por defecto para las variables ausentes
+        """
+        return cls(
+            api_token=os.getenv("API_TOKEN", cls.api_token),
+            environment=os.getenv("ENVIRONMENT", cls.environment).strip().lower(),
+            host=os.getenv("HOST", cls.host),
+            port=int(os.getenv("PORT", cls.port)),
+            log_level=os.getenv("LOG_LEVEL", cls.log_level).upper(),
+            log_format=os.getenv("LOG_FORMAT", cls.log_format).lower(),
+            log_sample_rate=float(os.getenv("LOG_SAMPLE_RATE", cls.log_sample_rate)),
+            max_requests_per_minute=int(os.getenv("MAX_REQUESTS_PER_MINUTE", cls.max_requests_per_minute)),
+            result_store_path=os.getenv("RESULT_STORE_PATH", cls.result_store_path),
+            result_store_max_age=int(os.getenv("RESULT_STORE_MAX_AGE", cls.result_store_max_age)),
+            compression_min_size=int(os.getenv("COMPRESSION_MIN_SIZE", cls.compression_min_size)),
+            scraper_max_workers=int(os.getenv("SCRAPER_MAX_WORKERS", cls.scraper_max_workers)),
+            streaming_parse=os.getenv("STREAMING_PARSE", "false").lower() in ("1", "true", "yes"),
+            parse_executor=os.getenv("PARSE_EXECUTOR", cls.parse_executor).lower(),
+            parse_workers=int(os.getenv("PARSE_WORKERS", cls.parse_workers)),
+            webhook_secret=os.getenv("WEBHOOK_SECRET", cls.webhook_secret),
+            webhook_queue_size=int(os.getenv("WEBHOOK_QUEUE_SIZE", cls.webhook_queue_size)),
+            webhook_workers=int(os.getenv("WEBHOOK_WORKERS", cls.webhook_workers)),
+            webhook_max_attempts=int(os.getenv("WEBHOOK_MAX_ATTEMPTS", cls.webhook_max_attempts)),
+            webhook_backoff_base=float(os.getenv("WEBHOOK_BACKOFF_BASE", cls.webhook_backoff_base)),
+            webhook_allowed_hosts=tuple(
+                host.strip().lower() for host in os.getenv("WEBHOOK_ALLOWED_HOSTS", "").split(",") if host.strip()
+            ),
+            watchlist_enabled=os.getenv("WATCHLIST_ENABLED", "true").lower() in ("1", "true", "yes"),
+            watchlist_interval=int(os.getenv("WATCHLIST_INTERVAL", cls.watchlist_interval)),
+            watchlist_poll_interval=int(os.getenv("WATCHLIST_POLL_INTERVAL", cls.watchlist_poll_interval)),
+            watchlist_batch_size=int(os.getenv("WATCHLIST_BATCH_SIZE", cls.watchlist_batch_size)),
+            watchlist_retry_delay=int(os.getenv("WATCHLIST_RETRY_DELAY", cls.watchlist_retry_delay)),
+            workers=int(os.getenv("WORKERS", cls.workers)),
+            keep_alive_timeout=int(os.getenv("KEEP_ALIVE_TIMEOUT", cls.keep_alive_timeout)),
+            backlog=int(os.getenv("BACKLOG", cls.backlog)),
+            graceful_shutdown_timeout=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", cls.graceful_shutdown_timeout)),
+        )
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Obtiene la configuración de la aplicación.
+    Carga el archivo .env la primera vez que se llama.
+
+    Returns:
+        Settings: Configuración compartida del proceso
+    """
+    load_dotenv()
+    return Settings.from_env()
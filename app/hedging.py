@@ -0,0 +1,140 @@
+import hashlib
+import hmac
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Callable, List, Optional
+
+
+class LatencyStats:
+    """
+    Latencias recientes de una fuente, para decidir cuándo lanzar una petición duplicada.
+
+    Guarda una ventana de las últimas mediciones; los percentiles sólo se
+    calculan cuando hay suficientes muestras.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        """
+        Registra la duración de una petición.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Calcula el percentil q (0-100) de las latencias recientes.
+
+        Returns:
+            Optional[float]: Latencia en segundos, o None si no hay suficientes muestras
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * q / 100))
+        return ordered[index]
+
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+
+
+def hedged_submit(executor: Executor, fn: Callable, hedge_after: Optional[float]) -> Future:
+    """
+    Ejecuta fn en el executor y, si tarda más de hedge_after segundos, lanza una
+    copia; devuelve el resultado del primer intento que termine bien.
+
+    Args:
+        executor: Executor donde se ejecutan los intentos
+        fn: Función sin argumentos a ejecutar
+        hedge_after: Segundos antes de lanzar la copia (None = sin copia)
+
+    Returns:
+        Future: Se completa con el primer resultado correcto, o con el error si
+            fallan todos los intentos lanzados
+    """
+    result: Future = Future()
+    attempts: List[Future] = []
+    lock = threading.Lock()
+
+    def on_done(attempt: Future):
+        error = attempt.exception()
+        with lock:
+            # running(): otro intento ya ganó y está fijando su resultado fuera del lock
+            if result.done() or result.running():
+                return
+            if error is not None and not all(other.done() for other in attempts):
+                # Otro intento sigue en curso: esperar a que termine
+                return
+            # Marcar como resuelto antes de salir del lock para que sólo gane un intento
+            result.set_running_or_notify_cancel()
+        if error is None:
+            result.set_result(attempt.result())
+        else:
+            result.set_exception(error)
+
+    def launch():
+        with lock:
+            if result.done() or result.running():
+                return
+            attempt = executor.submit(fn)
+            attempts.append(attempt)
+        attempt.add_done_callback(on_done)
+
+    launch()
+
+    if hedge_after is not None:
+        timer = threading.Timer(hedge_after, launch)
+        timer.daemon = True
+        timer.start()
+        result.add_done_callback(lambda _: timer.cancel())
+
+    return result
+
+
+def _sign(payload: bytes, secret: str) -> str:
+    return hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()[:32]
+
+
+def make_pending_token(reference: str, secret: str) -> str:
+    """
+    Crea el token para recuperar más tarde los resultados de fuentes pendientes.
+
+    El token sólo lleva la referencia de la búsqueda guardada en el almacén
+    local (ResultStore.save_pending), nunca el nombre buscado: va en la URL y
+    puede acabar en logs de proxies. Como el almacén es compartido, cualquier
+    worker puede responderlo.
+
+    Args:
+        reference: Referencia de la búsqueda pendiente
+        secret: Clave para firmar el token
+
+    Returns:
+        str: Token firmado
+    """
+    return f"{reference}.{_sign(reference.encode(), secret)}"
+
+
+def read_pending_token(token: str, secret: str) -> str:
+    """
+    Verifica un token de resultados pendientes.
+
+    Returns:
+        str: Referencia de la búsqueda pendiente
+
+    Raises:
+        ValueError: Si el token está mal formado o la firma no es válida
+    """
+    reference, separator, signature = token.rpartition(".")
+    if not separator or not reference:
+        raise ValueError("Token de resultados pendientes mal formado")
+
+    if not hmac.compare_digest(signature, _sign(reference.encode(), secret)):
+        raise ValueError("Token de resultados pendientes inválido")
+
+    return reference
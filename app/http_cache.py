@@ -0,0 +1,158 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+
+from .compression import choose_encoding, compress
+from .models import SearchResponse
+
+
+def make_etag(data: bytes, weak: bool = False) -> str:
+    """
+    Genera un ETag a partir del contenido.
+
+    Args:
+        data: Bytes que identifican el contenido
+        weak: Si es True genera un ETag débil (W/"...")
+
+    Returns:
+        str: ETag entre comillas, p. ej. '"3f2a..."' o 'W/"3f2a..."'
+    """
+    etag = '"' + hashlib.sha256(data).hexdigest()[:32] + '"'
+    return f"W/{etag}" if weak else etag
+
+
+def search_response_etag(result: SearchResponse) -> str:
+    """
+    Calcula el ETag de una respuesta de búsqueda.
+
+    Sólo se tiene en cuenta el contenido (entidad, fuentes consultadas y
+    fallidas y resultados), no el timestamp ni el tiempo de búsqueda, para que
+    dos búsquedas con los mismos resultados produzcan el mismo ETag.
+
+    Por eso el ETag es débil: dos cuerpos con el mismo ETag pueden diferir en
+    bytes (timestamp, search_time o compresión), aunque sean equivalentes.
+    """
+    content = result.model_dump(include={"entity_name", "sources_searched", "failed_sources", "results"})
+    return make_etag(json.dumps(content, sort_keys=True, default=str).encode(), weak=True)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Indica si la cabecera If-None-Match de la petición coincide con el ETag.
+
+    Usa la comparación débil de If-None-Match (RFC 9110): W/"x" y "x" coinciden.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Crea una respuesta 304 Not Modified para el ETag indicado.
+    """
+    return Response(status_code=304, headers={**(headers or {}), "ETag": etag})
+
+
+def cache_headers(ttl: int) -> Dict[str, str]:
+    """
+    Cabeceras para que navegadores y cachés compartidas (Nginx, CDN) reutilicen
+    una respuesta autenticada durante ttl segundos.
+
+    "public" permite a las cachés compartidas guardar respuestas de peticiones
+    con Authorization; "Vary: Authorization" evita servirlas a otro token.
+
+    Args:
+        ttl: Segundos de validez de la respuesta
+
+    Returns:
+        Dict[str, str]: Cabeceras Cache-Control y Vary
+    """
+    return {
+        "Cache-Control": f"public, max-age={ttl}, s-maxage={ttl}",
+        "Vary": "Authorization",
+    }
+
+
+def search_cache_headers(result: SearchResponse, ttl: int) -> Dict[str, str]:
+    """
+    Cabeceras de caché para una respuesta de búsqueda.
+
+    Una respuesta incompleta (fuentes fallidas o pendientes) no se puede
+    reutilizar: se envía con "no-store" para que ninguna caché sirva durante
+    todo el TTL una búsqueda a la que le faltan fuentes.
+
+    Args:
+        result: Resultado de la búsqueda
+        ttl: Segundos de validez si la respuesta está completa
+
+    Returns:
+        Dict[str, str]: Cabeceras Cache-Control y Vary
+    """
+    if result.failed_sources or result.pending_sources:
+        return {"Cache-Control": "no-store", "Vary": "Authorization"}
+    return cache_headers(ttl)
+
+
+def search_json_response(request: Request, result: SearchResponse,
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Serializa una respuesta de búsqueda con su ETag, o devuelve 304 si el
+    cliente ya tiene la misma versión (If-None-Match).
+
+    Args:
+        request: Petición HTTP
+        result: Resultado de la búsqueda
+        headers: Cabeceras adicionales para la respuesta
+
+    Returns:
+        Response: Respuesta JSON con ETag o 304 Not Modified
+    """
+    etag = search_response_etag(result)
+    if etag_matches(request, etag):
+        return not_modified(etag, headers)
+
+    body = json.dumps(jsonable_encoder(result), ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={**(headers or {}), "ETag": etag}
+    )
+
+
+class StaticJSON:
+    """
+    Respuesta JSON estática precalculada.
+
+    El cuerpo, su ETag y sus versiones gzip/brotli se calculan una sola vez; cada
+    petición sólo elige la variante adecuada.
+    """
+
+    def __init__(self, content: Any):
+        self.body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.etag = make_etag(self.body)
+        self._encoded: Dict[str, bytes] = {}
+
+    def response(self, request: Request) -> Response:
+        """
+        Devuelve la respuesta para la petición (304, comprimida o sin comprimir).
+        """
+        if etag_matches(request, self.etag):
+            return not_modified(self.etag)
+
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        encoding = choose_encoding(request.headers.get("accept-encoding", ""))
+        if encoding is None:
+            return Response(content=self.body, media_type="application/json", headers=headers)
+
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress(self.body, encoding)
+        headers["Content-Encoding"] = encoding
+        return Response(content=self._encoded[encoding], media_type="application/json", headers=headers)
@@ -0,0 +1,342 @@
+"""
+Logging estructurado de la aplicación.
+
+- Cada línea es un objeto JSON (LOG_FORMAT=json) con el id de la petición que
+  la originó (cabecera X-Request-ID), para poder seguir una búsqueda entre
+  hilos, fuentes y callbacks.
+- Los mensajes usan formato perezoso (logger.info("... %s", valor)): sólo se
+  formatean si el registro supera el nivel y el muestreo.
+- Los logs de éxito marcados con extra=SAMPLED se muestrean (LOG_SAMPLE_RATE);
+  la decisión depende del id de la petición, así que de una petición se
+  guardan todas sus líneas o ninguna. Los avisos y errores no se muestrean.
+- La escritura se hace en un hilo aparte (QueueHandler + QueueListener) para
+  que los hilos de la API no se bloqueen en la E/S del log.
+- Los nombres buscados son datos personales: no se escriben en los logs, sólo
+  una referencia (entity_ref) que permite correlacionar sin exponerlos. Por
+  eso los errores de red se describen sin su mensaje (que incluye la URL con
+  el nombre, ver describe_error) y el log de acceso de uvicorn se escribe sin
+  los valores de la query string ni el token de /search/pending.
+"""
+
+import atexit
+import contextvars
+import copy
+import hashlib
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import uuid
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional
+from urllib.parse import parse_qsl
+
+from .config import get_settings
+
+# Id de la petición en curso (se propaga a los hilos con propagate_request_id)
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Marca para los logs de éxito que se pueden muestrear: logger.info(..., extra=SAMPLED)
+SAMPLED = {"sampled": True}
+
+# Ids de petición aceptados desde la cabecera X-Request-ID
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+# Atributos estándar de LogRecord: el resto son campos añadidos con extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "sampled"}
+
+_listener: Optional[QueueListener] = None
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def bind_request_id(request_id: Optional[str]) -> contextvars.Token:
+    """
+    Asocia un id de petición al contexto actual.
+
+    Returns:
+        contextvars.Token: Token para restaurar el valor anterior con reset_request_id
+    """
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token):
+    _request_id.reset(token)
+
+
+def propagate_request_id(fn: Callable) -> Callable:
+    """
+    Envuelve fn para que se ejecute con el id de la petición actual.
+
+    Los executors no copian las contextvars al hilo o proceso que ejecuta la
+    tarea; hay que envolver la función al enviarla.
+    """
+    request_id = current_request_id()
+
+    def run(*args, **kwargs):
+        token = _request_id.set(request_id)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _request_id.reset(token)
+
+    return run
+
+
+class EntityRef:
+    """
+    Referencia a un nombre buscado para los logs, en lugar del nombre.
+
+    Se escribe como un hash del nombre normalizado: permite ver que dos líneas
+    hablan de la misma entidad sin exponerla. El hash se calcula al formatear,
+    así que no cuesta nada si el registro se descarta.
+    """
+    __slots__ = ("_entity_name",)
+
+    def __init__(self, entity_name: str):
+        self._entity_name = entity_name
+
+    def __str__(self) -> str:
+        normalized = " ".join(self._entity_name.lower().split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:12]
+
+    __repr__ = __str__
+
+
+def entity_ref(entity_name: str) -> EntityRef:
+    return EntityRef(entity_name)
+
+
+def describe_error(error: BaseException) -> str:
+    """
+    Describe un error para los logs sin su mensaje.
+
+    Los mensajes de requests incluyen la URL de la petición, y con ella el
+    nombre buscado en la query string; sólo se usan el tipo y, si lo hay, el
+    código HTTP.
+
+    Returns:
+        str: P. ej. "HTTPError 503" o "ConnectTimeout"
+    """
+    description = type(error).__name__
+    status_code = getattr(getattr(error, "response", None), "status_code", None)
+    if status_code is not None:
+        description += f" {status_code}"
+    return description
+
+
+# Segmento del token en /search/pending/{token}
+_PENDING_TOKEN = re.compile(r"^(/search/pending/)[^/?]+")
+
+
+def redact_path(path: str) -> str:
+    """
+    Quita de una ruta con query string los datos que pueden identificar al buscado.
+
+    Se conservan los nombres de los parámetros y se sustituyen sus valores y
+    el token de /search/pending por "***".
+    """
+    path, _, query = path.partition("?")
+    path = _PENDING_TOKEN.sub(r"\1***", path)
+    if query:
+        path += "?" + "&".join(f"{name}=***" for name, _ in parse_qsl(query, keep_blank_values=True))
+    return path
+
+
+class AccessLogFilter(logging.Filter):
+    """
+    Aplica redact_path a la ruta de cada línea del log de acceso de uvicorn.
+
+    uvicorn registra (cliente, método, ruta con query, versión HTTP, estado)
+    como argumentos del mensaje; sólo se modifica la ruta.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        if isinstance(args, tuple) and len(args) >= 3 and isinstance(args[2], str):
+            record.args = args[:2] + (redact_path(args[2]),) + args[3:]
+        return True
+
+
+class ContextFilter(logging.Filter):
+    """
+    Añade el id de petición a cada registro y aplica el muestreo de los logs de éxito.
+
+    Se instala en el QueueHandler, así que se ejecuta en el hilo que escribe
+    el log, donde la contextvar tiene el valor correcto.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        if getattr(record, "sampled", False) and self.sample_rate < 1.0:
+            return self._keep(record.request_id)
+        return True
+
+    def _keep(self, request_id: Optional[str]) -> bool:
+        if request_id is None:
+            return random.random() < self.sample_rate
+        return zlib.crc32(request_id.encode()) % 10000 < self.sample_rate * 10000
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            entry["request_id"] = request_id
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRS and name != "request_id":
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Formato de texto legible para desarrollo, con el id de petición y los campos extra.
+    """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        if not hasattr(record, "request_id"):
+            record.request_id = None
+        return super().format(record)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        # Los campos extra van en la misma línea, antes de la traza
+        line = super().formatMessage(record)
+        extra = {name: value for name, value in record.__dict__.items()
+                 if name not in _RECORD_ATTRS and name not in ("request_id", "asctime")}
+        if extra:
+            line += " " + " ".join(f"{name}={value}" for name, value in extra.items())
+        return line
+
+
+class _QueueHandler(QueueHandler):
+    """
+    QueueHandler que conserva los campos extra y la traza por separado para
+    que el formateador del listener pueda escribirlos como campos JSON.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+def setup_logging():
+    """
+    Configura el logging de la aplicación según LOG_LEVEL, LOG_FORMAT y LOG_SAMPLE_RATE.
+
+    Es idempotente: las llamadas posteriores a la primera no hacen nada.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    settings = get_settings()
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(TextFormatter() if settings.log_format == "text" else JSONFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(ContextFilter(settings.log_sample_rate))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.log_level)
+    app_logger.handlers[:] = [handler]
+    app_logger.propagate = False
+
+    # uvicorn configura sus loggers antes de importar la aplicación, así que
+    # el filtro se añade aquí y se conserva
+    access_logger = logging.getLogger("uvicorn.access")
+    if not any(isinstance(f, AccessLogFilter) for f in access_logger.filters):
+        access_logger.addFilter(AccessLogFilter())
+
+    _listener = QueueListener(log_queue, output)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """
+    Escribe los registros pendientes y detiene el hilo de logging.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que asigna un id a cada petición.
+
+    Usa la cabecera X-Request-ID si viene (p. ej. de un proxy) y es válida, o
+    genera uno nuevo; lo deja en el contexto para los logs y lo devuelve en
+    la respuesta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        request_id = request_id or new_request_id()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
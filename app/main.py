@@ -1,20 +1,33 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from fastapi import FastAPI, HTTPException, Depends, Request, Query
+from fastapi.security import HTTPBearer
+from fastapi.encoders import jsonable_encoder
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
-import os
-from dotenv import load_dotenv
 from datetime import datetime
+from typing import Optional
 
 # Importar nuestros módulos
-from .scraping import search_entity
-from .models import SearchRequest, SearchResponse, EntityResult, ErrorResponse
-from .auth import verify_token, get_api_token
-from .rate_limit import limiter, get_rate_limit_info, create_rate_limit_exceeded_response
+# El scraping (requests, BeautifulSoup) y el almacén SQLite se importan en el
+# primer uso para que el arranque de cada worker sea rápido.
+from .config import get_settings
+from .compression import CompressionMiddleware
+from .logging_config import RequestIdMiddleware, setup_logging
+from .http_cache import StaticJSON, search_cache_headers, search_json_response
+from .sources import available_sources, cache_ttl, resolve_sources
+from .models import (
+    SearchRequest, SearchResponse, ErrorResponse,
+    StoredSearchRequest, HistoryEntry, HistoryResponse, StoredEntitiesResponse,
+    CallbackAcceptedResponse, WatchlistRequest, WatchlistEntry, WatchlistResponse,
+    WatchlistChange, WatchlistChangesResponse
+)
+from .auth import verify_token
+from .rate_limit import limiter, search_rate_limit, get_rate_limit_info, create_rate_limit_exceeded_response
 
-# Cargar variables de entorno
-load_dotenv()
+# Logs JSON estructurados, escritos desde un hilo aparte (LOG_LEVEL, LOG_FORMAT)
+setup_logging()
 
 # Crear la aplicación FastAPI
 app = FastAPI(
@@ -25,7 +38,7 @@ app = FastAPI(
     ## Características
     * 🔍 Búsqueda en múltiples fuentes (Offshore Leaks, World Bank, OFAC)
     * 🔐 Autenticación con Bearer Token
-    * ⏱️ Rate limiting (20 llamadas por minuto)
+    * ⏱️ Rate limiting por IP (MAX_REQUESTS_PER_MINUTE, 20 llamadas por minuto por defecto)
     * 📊 Resultados estructurados con metadatos
     
     ## Fuentes disponibles
@@ -51,6 +64,88 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Configurar autenticación
 security = HTTPBearer()
 
+def validate_sources(source):
+    """
+    Convierte el campo source de una petición en la lista de fuentes a buscar.
+    
+    Raises:
+        HTTPException: Si alguna fuente no existe
+    """
+    try:
+        return resolve_sources(source)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def budget_seconds(search_request: SearchRequest) -> Optional[float]:
+    """
+    Convierte el presupuesto de latencia de la petición a segundos.
+    """
+    if search_request.latency_budget_ms is None:
+        return None
+    return search_request.latency_budget_ms / 1000
+
+def check_callbacks_enabled():
+    """
+    Comprueba que se pueden enviar callbacks (WEBHOOK_SECRET definido).
+    
+    Raises:
+        HTTPException: 503 si WEBHOOK_SECRET no está configurado
+    """
+    if not get_settings().webhook_secret:
+        raise HTTPException(
+            status_code=503,
+            detail="Los callbacks no están disponibles: WEBHOOK_SECRET no está configurado"
+        )
+
+def check_callback_destination(callback_url: str):
+    """
+    Comprueba, resolviendo el host, que callback_url apunta a un destino público.
+    
+    Raises:
+        HTTPException: 400 si el destino no está permitido
+    """
+    from .webhooks import check_callback_url
+    
+    try:
+        check_callback_url(callback_url)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def accept_callback(callback_url: str, **search_kwargs) -> JSONResponse:
+    """
+    Encola una búsqueda cuyo resultado se entregará por callback y responde 202.
+    
+    Args:
+        callback_url: URL a la que se enviará el SearchResponse
+        search_kwargs: Argumentos para search_entity
+        
+    Returns:
+        JSONResponse: Respuesta 202 con el identificador de la entrega
+        
+    Raises:
+        HTTPException: 400 si callback_url apunta a un destino no permitido,
+            503 si no hay WEBHOOK_SECRET o la cola de entregas está llena
+    """
+    from .scraping import search_entity
+    from .webhooks import get_dispatcher, new_job_id
+    
+    check_callbacks_enabled()
+    # La resolución DNS bloquea: se hace fuera del bucle de eventos
+    await run_in_threadpool(check_callback_destination, callback_url)
+    
+    dispatcher = get_dispatcher()
+    if not dispatcher.try_reserve():
+        raise HTTPException(
+            status_code=503,
+            detail="La cola de callbacks está llena, inténtalo más tarde"
+        )
+    
+    job_id = new_job_id()
+    dispatcher.submit_job(job_id, callback_url, lambda: search_entity(**search_kwargs))
+    
+    accepted = CallbackAcceptedResponse(job_id=job_id, callback_url=callback_url)
+    return JSONResponse(status_code=202, content=jsonable_encoder(accepted))
+
 @app.get("/", tags=["Información"])
 async def root():
     """
@@ -63,6 +158,11 @@ async def root():
         "timestamp": datetime.now().isoformat(),
         "endpoints": {
             "search": "/search",
+            "search_get": "/search?entity_name=...&source=...",
+            "search_stored": "/search/stored",
+            "search_pending": "/search/pending/{token}",
+            "history": "/history",
+            "watchlist": "/watchlist",
             "health": "/health",
             "docs": "/docs",
             "rate_limit_info": "/rate-limit-info"
@@ -81,11 +181,11 @@ async def health_check():
     }
 
 @app.get("/rate-limit-info", tags=["Información"])
-async def rate_limit_info():
+async def rate_limit_info(request: Request):
     """
     Endpoint que proporciona información sobre los límites de velocidad.
     """
-    return get_rate_limit_info()
+    return RATE_LIMIT_INFO_RESPONSE.response(request)
 
 @app.post("/search", 
           response_model=SearchResponse,
@@ -96,15 +196,28 @@ async def rate_limit_info():
           
           **Requerimientos:**
           * Autenticación con Bearer Token
-          * Rate limiting: máximo 20 llamadas por minuto
+          * Rate limiting: máximo MAX_REQUESTS_PER_MINUTE llamadas por minuto (20 por defecto)
           
           **Fuentes disponibles:**
           * `all`: Busca en todas las fuentes
           * `offshore_leaks`: Solo Offshore Leaks Database
           * `world_bank`: Solo World Bank Debarred Firms
           * `ofac`: Solo OFAC Sanctions
+          
+          `source` acepta también una lista, p. ej. `["offshore_leaks", "ofac"]`.
+          Las fuentes seleccionadas se consultan en paralelo.
+          
+          **Presupuesto de latencia:** con `latency_budget_ms`, las fuentes lentas
+          reciben una petición duplicada si superan su p95 observado y, al agotarse
+          el presupuesto, se responde con las fuentes terminadas. Las demás se
+          listan en `pending_sources` y se recuperan con `pending_token` en
+          `/search/pending/{token}`.
+          
+          **Callback:** con `callback_url` la API responde `202 Accepted` al
+          instante y envía el `SearchResponse` final por POST a esa URL, firmado
+          con HMAC-SHA256 (cabeceras `X-Webhook-Signature` y `X-Webhook-Timestamp`).
           """)
-@limiter.limit("20/minute")
+@limiter.limit(search_rate_limit)
 async def search_entity_endpoint(
     request: Request,
     search_request: SearchRequest,
@@ -132,21 +245,33 @@ async def search_entity_endpoint(
                 detail="El nombre de la entidad no puede estar vacío"
             )
         
-        # Validar la fuente especificada
-        valid_sources = ["all", "offshore_leaks", "world_bank", "ofac"]
-        if search_request.source not in valid_sources:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Fuente inválida. Fuentes válidas: {', '.join(valid_sources)}"
+        # Validar las fuentes especificadas
+        plugins = validate_sources(search_request.source)
+        
+        from .scraping import search_entity
+        from .storage import get_result_store
+        
+        # Con callback_url se responde 202 y el resultado se entrega después
+        if search_request.callback_url:
+            return await accept_callback(
+                search_request.callback_url,
+                entity_name=search_request.entity_name,
+                source=[plugin.id for plugin in plugins],
+                store=get_result_store(),
+                latency_budget=budget_seconds(search_request)
             )
         
-        # Realizar la búsqueda
-        result = search_entity(
+        # Realizar la búsqueda (los resultados se guardan en el almacén local)
+        result = await run_in_threadpool(
+            search_entity,
             entity_name=search_request.entity_name,
-            source=search_request.source
+            source=[plugin.id for plugin in plugins],
+            store=get_result_store(),
+            latency_budget=budget_seconds(search_request)
         )
         
-        return result
+        # Responder con ETag (304 si el cliente ya tiene estos resultados)
+        return search_json_response(request, result)
         
     except HTTPException:
         # Re-lanzar las excepciones HTTP que ya hemos creado
@@ -158,62 +283,450 @@ async def search_entity_endpoint(
             detail=f"Error interno del servidor: {str(e)}"
         )
 
+@app.get("/search",
+         response_model=SearchResponse,
+         tags=["Búsqueda"],
+         summary="Buscar entidad (GET, cacheable)",
+         description="""
+         Variante GET de `/search` con los parámetros en la query string, para
+         que un proxy inverso o CDN pueda cachear las respuestas.
+         
+         La respuesta incluye `Cache-Control: public, max-age=<ttl>, s-maxage=<ttl>`
+         con el TTL de la fuente buscada (el más corto si se buscan varias) y
+         `Vary: Authorization`. Si alguna fuente falla (`failed_sources`), la
+         respuesta lleva `Cache-Control: no-store` y no se cachea.
+         """)
+@limiter.limit(search_rate_limit)
+async def search_entity_get_endpoint(
+    request: Request,
+    entity_name: str = Query(..., min_length=1, max_length=200, description="Nombre de la entidad a buscar"),
+    source: str = Query("all", description="Fuente o fuentes separadas por comas (offshore_leaks, world_bank, ofac, all)"),
+    token: str = Depends(verify_token)
+):
+    """
+    Endpoint GET para buscar entidades con cabeceras de caché HTTP.
+    
+    Args:
+        request: Petición HTTP
+        entity_name: Nombre de la entidad a buscar
+        source: Fuente específica para buscar
+        token: Token de autenticación
+        
+    Returns:
+        SearchResponse: Resultados de la búsqueda
+        
+    Raises:
+        HTTPException: Si hay errores en la búsqueda
+    """
+    try:
+        if not entity_name.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="El nombre de la entidad no puede estar vacío"
+            )
+        
+        plugins = validate_sources(source)
+        
+        from .scraping import search_entity
+        from .storage import get_result_store
+        
+        result = await run_in_threadpool(
+            search_entity,
+            entity_name=entity_name,
+            source=[plugin.id for plugin in plugins],
+            store=get_result_store()
+        )
+        
+        return search_json_response(request, result, headers=search_cache_headers(result, cache_ttl(plugins)))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error interno del servidor: {str(e)}"
+        )
+
+@app.post("/search/stored",
+          response_model=SearchResponse,
+          tags=["Búsqueda"],
+          summary="Buscar entidad usando el almacén local",
+          description="""
+          Igual que `/search`, pero las fuentes con resultados guardados más
+          recientes que `max_age` segundos se responden desde el almacén local
+          sin hacer scraping. Las demás se consultan y se guardan.
+          
+          Las fuentes respondidas desde el almacén se indican en `cached_sources`.
+          """)
+@limiter.limit(search_rate_limit)
+async def search_stored_endpoint(
+    request: Request,
+    search_request: StoredSearchRequest,
+    token: str = Depends(verify_token)
+):
+    """
+    Endpoint de búsqueda que reutiliza los resultados guardados si son recientes.
+    
+    Args:
+        request: Petición HTTP
+        search_request: Datos de la búsqueda y antigüedad máxima aceptada
+        token: Token de autenticación
+        
+    Returns:
+        SearchResponse: Resultados de la búsqueda
+        
+    Raises:
+        HTTPException: Si hay errores en la búsqueda
+    """
+    try:
+        if not search_request.entity_name.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="El nombre de la entidad no puede estar vacío"
+            )
+        
+        plugins = validate_sources(search_request.source)
+        
+        from .scraping import search_entity
+        from .storage import get_result_store
+        
+        max_age = search_request.max_age
+        if max_age is None:
+            max_age = get_settings().result_store_max_age
+        
+        if search_request.callback_url:
+            return await accept_callback(
+                search_request.callback_url,
+                entity_name=search_request.entity_name,
+                source=[plugin.id for plugin in plugins],
+                store=get_result_store(),
+                max_age=max_age,
+                latency_budget=budget_seconds(search_request)
+            )
+        
+        result = await run_in_threadpool(
+            search_entity,
+            entity_name=search_request.entity_name,
+            source=[plugin.id for plugin in plugins],
+            store=get_result_store(),
+            max_age=max_age,
+            latency_budget=budget_seconds(search_request)
+        )
+        
+        return search_json_response(request, result)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error interno del servidor: {str(e)}"
+        )
+
+@app.get("/search/pending/{token}",
+         response_model=SearchResponse,
+         tags=["Búsqueda"],
+         summary="Recuperar resultados pendientes")
+@limiter.limit("60/minute")
+def get_pending_search(
+    request: Request,
+    token: str,
+    token_auth: str = Depends(verify_token)
+):
+    """
+    Devuelve los resultados de las fuentes que no terminaron dentro del
+    presupuesto de latencia de una búsqueda anterior.
+    
+    Args:
+        request: Petición HTTP
+        token: Token devuelto en pending_token
+        token_auth: Token de autenticación
+        
+    Returns:
+        SearchResponse: Resultados ya disponibles; si quedan fuentes en curso,
+            aparecen en pending_sources junto con el mismo token
+        
+    Raises:
+        HTTPException: Si el token no es válido
+    """
+    from .scraping import get_pending_results
+    from .storage import get_result_store
+    
+    try:
+        result = get_pending_results(token, get_result_store())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return search_json_response(request, result)
+
+@app.get("/history",
+         response_model=HistoryResponse,
+         tags=["Histórico"],
+         summary="Consultar búsquedas pasadas")
+def get_history(
+    entity_name: Optional[str] = None,
+    source: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 50,
+    token: str = Depends(verify_token)
+):
+    """
+    Endpoint de auditoría: qué devolvió cada fuente para una entidad en un periodo.
+    
+    Es síncrono a propósito: FastAPI lo ejecuta en su pool de hilos, así que
+    las consultas a SQLite no bloquean el bucle de eventos.
+    
+    Args:
+        entity_name: Nombre buscado
+        source: Identificador de la fuente (offshore_leaks, world_bank, ofac)
+        since: Fecha mínima (ISO 8601)
+        until: Fecha máxima (ISO 8601)
+        limit: Número máximo de búsquedas devueltas (1-500)
+        token: Token de autenticación
+        
+    Returns:
+        HistoryResponse: Búsquedas registradas con sus resultados
+    """
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="El límite debe estar entre 1 y 500")
+    
+    from .storage import get_result_store
+    
+    entries = get_result_store().history(
+        entity_name=entity_name,
+        source=source,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        limit=limit
+    )
+    
+    return HistoryResponse(
+        total=len(entries),
+        entries=[
+            HistoryEntry(**{**entry, "searched_at": datetime.fromtimestamp(entry["searched_at"])})
+            for entry in entries
+        ]
+    )
+
+@app.get("/history/search",
+         response_model=StoredEntitiesResponse,
+         tags=["Histórico"],
+         summary="Búsqueda de texto completo en las entidades guardadas")
+def search_history(
+    q: str,
+    source: Optional[str] = None,
+    limit: int = 50,
+    token: str = Depends(verify_token)
+):
+    """
+    Busca texto libre (nombre, dirección, país, programas...) en todas las
+    entidades guardadas, sin consultar las fuentes externas.
+    
+    Args:
+        q: Texto a buscar
+        source: Identificador de la fuente (offshore_leaks, world_bank, ofac) o varios
+            separados por comas
+        limit: Número máximo de resultados (1-500)
+        token: Token de autenticación
+        
+    Returns:
+        StoredEntitiesResponse: Entidades ordenadas por relevancia
+    """
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="El texto de búsqueda no puede estar vacío")
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="El límite debe estar entre 1 y 500")
+    
+    from .storage import get_result_store
+    
+    source_names = [plugin.name for plugin in validate_sources(source)] if source else None
+    results = get_result_store().search_text(q, source_names=source_names, limit=limit)
+    
+    return StoredEntitiesResponse(
+        query=q,
+        total_hits=len(results),
+        results=results
+    )
+
+# Respuestas estáticas precalculadas (cuerpo, ETag y versiones comprimidas)
+SOURCES_RESPONSE = StaticJSON({
+    "sources": [plugin.describe() for plugin in available_sources()]
+})
+
+RATE_LIMIT_INFO_RESPONSE = StaticJSON(get_rate_limit_info())
+
+@app.post("/watchlist",
+          response_model=WatchlistEntry,
+          status_code=201,
+          tags=["Watchlist"],
+          summary="Vigilar un nombre")
+def add_to_watchlist(
+    watch_request: WatchlistRequest,
+    token: str = Depends(verify_token)
+):
+    """
+    Añade un nombre a la lista de vigilancia.
+    
+    El nombre se re-screenea cada WATCHLIST_INTERVAL segundos. Si el conjunto de
+    resultados no cambia sólo se compara su huella; si cambia, se registra un
+    cambio con las coincidencias nuevas y eliminadas (y se envía a callback_url).
+    
+    Args:
+        watch_request: Nombre, fuentes y URL de notificación
+        token: Token de autenticación
+        
+    Returns:
+        WatchlistEntry: Entrada creada
+    """
+    from .watchlist import get_watchlist_store
+    
+    if not watch_request.entity_name.strip():
+        raise HTTPException(status_code=400, detail="El nombre de la entidad no puede estar vacío")
+    
+    plugins = validate_sources(watch_request.source)
+    if watch_request.callback_url:
+        check_callbacks_enabled()
+        check_callback_destination(watch_request.callback_url)
+    record = get_watchlist_store().add(
+        watch_request.entity_name,
+        [plugin.id for plugin in plugins],
+        watch_request.callback_url
+    )
+    return WatchlistEntry.from_record(record)
+
+@app.get("/watchlist",
+         response_model=WatchlistResponse,
+         tags=["Watchlist"],
+         summary="Listar nombres vigilados")
+def list_watchlist(token: str = Depends(verify_token)):
+    """
+    Devuelve todos los nombres de la lista de vigilancia.
+    """
+    from .watchlist import get_watchlist_store
+    
+    entries = [WatchlistEntry.from_record(record) for record in get_watchlist_store().entries()]
+    return WatchlistResponse(total=len(entries), entries=entries)
+
+@app.delete("/watchlist/{watch_id}",
+            status_code=204,
+            tags=["Watchlist"],
+            summary="Dejar de vigilar un nombre")
+def remove_from_watchlist(watch_id: int, token: str = Depends(verify_token)):
+    """
+    Elimina un nombre de la lista de vigilancia.
+    """
+    from .watchlist import get_watchlist_store
+    
+    if not get_watchlist_store().remove(watch_id):
+        raise HTTPException(status_code=404, detail="Nombre vigilado no encontrado")
+
+@app.get("/watchlist/changes",
+         response_model=WatchlistChangesResponse,
+         tags=["Watchlist"],
+         summary="Cambios detectados")
+def get_watchlist_changes(
+    since: Optional[datetime] = None,
+    entity_name: Optional[str] = None,
+    limit: int = 100,
+    token: str = Depends(verify_token)
+):
+    """
+    Devuelve los cambios (coincidencias nuevas o eliminadas) detectados al
+    re-screenear los nombres vigilados.
+    
+    Args:
+        since: Fecha mínima (ISO 8601)
+        entity_name: Filtra por nombre vigilado
+        limit: Número máximo de cambios (1-500)
+        token: Token de autenticación
+        
+    Returns:
+        WatchlistChangesResponse: Cambios, del más reciente al más antiguo
+    """
+    from .watchlist import get_watchlist_store
+    
+    if not 1 <= limit <= 500:
+        raise HTTPException(status_code=400, detail="El límite debe estar entre 1 y 500")
+    
+    changes = get_watchlist_store().changes(
+        since=since.timestamp() if since else None,
+        entity_name=entity_name,
+        limit=limit
+    )
+    return WatchlistChangesResponse(
+        total=len(changes),
+        changes=[WatchlistChange.from_record(change) for change in changes]
+    )
+
 @app.get("/sources", tags=["Información"])
-async def get_available_sources():
+async def get_available_sources(request: Request):
     """
     Endpoint que lista las fuentes disponibles para búsqueda.
     """
-    return {
-        "sources": [
-            {
-                "id": "offshore_leaks",
-                "name": "Offshore Leaks Database",
-                "url": "https://offshoreleaks.icij.org",
-                "description": "Base de datos de entidades offshore y jurisdicciones",
-                "attributes": ["Entity", "Jurisdiction", "Linked To", "Data From"]
-            },
-            {
-                "id": "world_bank",
-                "name": "World Bank Debarred Firms",
-                "url": "https://projects.worldbank.org/en/projects-operations/procurement/debarred-firms",
-                "description": "Lista de firmas ineligibles para contratos del Banco Mundial",
-                "attributes": ["Firm Name", "Address", "Country", "From Date", "To Date", "Grounds"]
-            },
-            {
-                "id": "ofac",
-                "name": "OFAC Sanctions",
-                "url": "https://sanctionssearch.ofac.treas.gov",
-                "description": "Lista de sanciones de la Oficina de Control de Activos Extranjeros",
-                "attributes": ["Name", "Address", "Type", "Program(s)", "List", "Score"]
-            }
-        ]
-    }
+    return SOURCES_RESPONSE.response(request)
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """
     Manejador personalizado para excepciones HTTP.
     """
-    return ErrorResponse(
+    error = ErrorResponse(
         error=exc.detail,
         detail=f"Error {exc.status_code}: {exc.detail}",
         timestamp=datetime.now()
     )
+    return JSONResponse(
+        status_code=exc.status_code,
+        content=jsonable_encoder(error),
+        headers=getattr(exc, "headers", None)
+    )
 
 @app.exception_handler(RateLimitExceeded)
 async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
     """
     Manejador personalizado para excepciones de rate limiting.
     """
-    return create_rate_limit_exceeded_response(request, exc)
+    content = create_rate_limit_exceeded_response(request, exc)
+    return JSONResponse(
+        status_code=429,
+        content=content,
+        headers={"Retry-After": str(content["retry_after"])}
+    )
 
-# Configurar CORS para permitir peticiones desde diferentes orígenes
-from fastapi.middleware.cors import CORSMiddleware
+@app.on_event("startup")
+async def start_watchlist():
+    """
+    Arranca el re-screening periódico de la lista de vigilancia.
+    """
+    from .watchlist import start_scheduler
+    start_scheduler()
 
+@app.on_event("shutdown")
+async def shutdown_webhooks():
+    """
+    Detiene la watchlist, intenta entregar los callbacks pendientes y cierra
+    el executor de parseo antes de detener el worker.
+    """
+    from .parsing import shutdown_parse_executor
+    from .watchlist import stop_scheduler
+    from .webhooks import shutdown_dispatcher
+    await run_in_threadpool(stop_scheduler)
+    await run_in_threadpool(shutdown_dispatcher)
+    await run_in_threadpool(shutdown_parse_executor)
+
+# Comprimir (brotli/gzip) las respuestas JSON grandes
+app.add_middleware(CompressionMiddleware, minimum_size=get_settings().compression_min_size)
+
+# Configurar CORS para permitir peticiones desde diferentes orígenes
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # En producción, especifica los orígenes permitidos
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-) 
\ No newline at end of file
+    expose_headers=["X-Request-ID"],
+)
+
+# Asignar un id a cada petición (cabecera X-Request-ID) para correlacionar los logs
+app.add_middleware(RequestIdMiddleware) 
\ No newline at end of file
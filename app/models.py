@@ -1,7 +1,18 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import AfterValidator, BaseModel, Field
+from typing import Annotated, List, Optional, Union
 from datetime import datetime
 
+
+def _validate_callback_url(value: str) -> str:
+    # Sin consultar el DNS: la resolución se comprueba en el endpoint, fuera
+    # del bucle de eventos, y de nuevo en cada entrega
+    from .webhooks import check_callback_url
+    return check_callback_url(value, resolve=False)
+
+
+# URL de callback: http(s) y sin direcciones privadas, locales ni reservadas
+CallbackUrl = Annotated[str, AfterValidator(_validate_callback_url)]
+
 class SearchRequest(BaseModel):
     """
     Modelo para las peticiones de búsqueda.
@@ -14,10 +25,38 @@ class SearchRequest(BaseModel):
         max_length=200,
         example="John Doe"
     )
-    source: Optional[str] = Field(
+    source: Optional[Union[str, List[str]]] = Field(
         default="all",
-        description="Fuente específica para buscar (offshore_leaks, world_bank, ofac, all)",
-        example="offshore_leaks"
+        description="Fuente o lista de fuentes para buscar (offshore_leaks, world_bank, ofac, all)",
+        example=["offshore_leaks", "ofac"]
+    )
+    latency_budget_ms: Optional[int] = Field(
+        default=None,
+        description="Tiempo máximo de respuesta en milisegundos. Al agotarse se devuelven "
+                    "las fuentes terminadas y el resto queda pendiente (ver pending_token)",
+        ge=1,
+        le=60000,
+        example=800
+    )
+    callback_url: Optional[CallbackUrl] = Field(
+        default=None,
+        description="Si se indica, la API responde 202 al instante y envía el SearchResponse "
+                    "final por POST a esta URL (firmado con HMAC-SHA256)",
+        max_length=2000,
+        example="https://mi-sistema.example.com/screening/callback"
+    )
+
+class StoredSearchRequest(SearchRequest):
+    """
+    Modelo para las búsquedas que pueden responderse desde el almacén local.
+    Si los datos guardados de una fuente son más recientes que max_age, no se hace scraping.
+    """
+    max_age: Optional[int] = Field(
+        default=None,
+        description="Antigüedad máxima aceptada de los datos guardados, en segundos "
+                    "(por defecto RESULT_STORE_MAX_AGE)",
+        ge=0,
+        example=86400
     )
 
 class EntityResult(BaseModel):
@@ -50,9 +89,124 @@ class SearchResponse(BaseModel):
     total_hits: int = Field(..., description="Número total de coincidencias encontradas")
     search_time: float = Field(..., description="Tiempo de búsqueda en segundos")
     sources_searched: List[str] = Field(..., description="Fuentes que se buscaron")
+    cached_sources: List[str] = Field(default_factory=list, description="Fuentes respondidas desde el almacén local sin scraping")
+    pending_sources: List[str] = Field(default_factory=list, description="Fuentes que no terminaron dentro del presupuesto de latencia")
+    pending_token: Optional[str] = Field(None, description="Token para recuperar los resultados pendientes en /search/pending/{token}")
+    failed_sources: List[str] = Field(default_factory=list, description="Fuentes que no se pudieron consultar (error de red o de parseo); sus resultados no están incluidos")
     results: List[EntityResult] = Field(..., description="Lista de entidades encontradas")
     timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp de la búsqueda")
 
+class CallbackAcceptedResponse(BaseModel):
+    """
+    Modelo para la respuesta 202 de una búsqueda con callback_url.
+    El resultado se enviará más tarde a la URL de callback.
+    """
+    job_id: str = Field(..., description="Identificador de la entrega (cabecera X-Webhook-Id)")
+    status: str = Field("accepted", description="Estado de la búsqueda")
+    callback_url: str = Field(..., description="URL a la que se enviará el resultado")
+
+class HistoryEntry(BaseModel):
+    """
+    Modelo para una búsqueda registrada en el almacén local.
+    Cada entrada corresponde al scraping de una fuente en un momento dado.
+    """
+    entity_name: str = Field(..., description="Nombre de la entidad buscada")
+    source: str = Field(..., description="Identificador de la fuente consultada")
+    searched_at: datetime = Field(..., description="Momento en que se hizo el scraping")
+    total_hits: int = Field(..., description="Número de coincidencias devueltas por la fuente")
+    results: List[EntityResult] = Field(..., description="Entidades devueltas por la fuente")
+
+class HistoryResponse(BaseModel):
+    """
+    Modelo para las respuestas de consulta del histórico.
+    Define qué datos devuelve la API al consultar búsquedas pasadas.
+    """
+    total: int = Field(..., description="Número de búsquedas devueltas")
+    entries: List[HistoryEntry] = Field(..., description="Búsquedas registradas, de la más reciente a la más antigua")
+
+class StoredEntitiesResponse(BaseModel):
+    """
+    Modelo para las respuestas de búsqueda de texto completo en el almacén local.
+    """
+    query: str = Field(..., description="Texto buscado")
+    total_hits: int = Field(..., description="Número de entidades encontradas")
+    results: List[EntityResult] = Field(..., description="Entidades guardadas ordenadas por relevancia")
+
+class WatchlistRequest(BaseModel):
+    """
+    Modelo para añadir un nombre a la lista de vigilancia.
+    El nombre se re-screenea periódicamente y sólo se notifican los cambios.
+    """
+    entity_name: str = Field(
+        ...,
+        description="Nombre de la entidad a vigilar",
+        min_length=1,
+        max_length=200,
+        example="John Doe"
+    )
+    source: Optional[Union[str, List[str]]] = Field(
+        default="all",
+        description="Fuente o lista de fuentes a consultar (offshore_leaks, world_bank, ofac, all)",
+        example="all"
+    )
+    callback_url: Optional[CallbackUrl] = Field(
+        default=None,
+        description="URL a la que enviar por POST cada cambio detectado (firmado con HMAC-SHA256)",
+        max_length=2000,
+        example="https://mi-sistema.example.com/watchlist/changes"
+    )
+
+class WatchlistEntry(BaseModel):
+    """
+    Modelo para un nombre de la lista de vigilancia.
+    """
+    id: int = Field(..., description="Identificador del nombre vigilado")
+    entity_name: str = Field(..., description="Nombre vigilado")
+    sources: List[str] = Field(..., description="Fuentes consultadas")
+    callback_url: Optional[str] = Field(None, description="URL de notificación de cambios")
+    created_at: datetime = Field(..., description="Momento en que se añadió")
+    last_checked: Optional[datetime] = Field(None, description="Último screening")
+    fingerprint: Optional[str] = Field(None, description="Huella de los resultados del último screening")
+    total_hits: int = Field(..., description="Coincidencias en el último screening")
+
+    @classmethod
+    def from_record(cls, record: dict) -> "WatchlistEntry":
+        return cls(**{
+            **record,
+            "created_at": datetime.fromtimestamp(record["created_at"]),
+            "last_checked": datetime.fromtimestamp(record["last_checked"]) if record["last_checked"] else None,
+        })
+
+class WatchlistResponse(BaseModel):
+    """
+    Modelo para la respuesta con la lista de vigilancia completa.
+    """
+    total: int = Field(..., description="Número de nombres vigilados")
+    entries: List[WatchlistEntry] = Field(..., description="Nombres vigilados")
+
+class WatchlistChange(BaseModel):
+    """
+    Modelo para un cambio detectado al re-screenear un nombre vigilado.
+    Sólo contiene las coincidencias nuevas y las que desaparecieron.
+    """
+    id: int = Field(..., description="Identificador del cambio")
+    watch_id: int = Field(..., description="Nombre vigilado al que corresponde")
+    entity_name: str = Field(..., description="Nombre vigilado")
+    detected_at: datetime = Field(..., description="Momento en que se detectó")
+    added: List[EntityResult] = Field(..., description="Coincidencias nuevas")
+    removed: List[EntityResult] = Field(..., description="Coincidencias que ya no aparecen")
+
+    @classmethod
+    def from_record(cls, record: dict) -> "WatchlistChange":
+        return cls(**{**record, "detected_at": datetime.fromtimestamp(record["detected_at"])})
+
+class WatchlistChangesResponse(BaseModel):
+    """
+    Modelo para la respuesta con los cambios detectados en la lista de vigilancia.
+    """
+    total: int = Field(..., description="Número de cambios devueltos")
+    changes: List[WatchlistChange] = Field(..., description="Cambios, del más reciente al más antiguo")
+
 class ErrorResponse(BaseModel):
     """
     Modelo para las respuestas de error.
@@ -0,0 +1,170 @@
+"""
+Executor de parseo: saca el parseo de las páginas (CPU) de los hilos de scraping.
+
+Con muchas búsquedas concurrentes la descarga ya no es el cuello de botella,
+sino BeautifulSoup, que el GIL serializa dentro de cada worker. Con
+PARSE_EXECUTOR=process el parseo se hace en un pool de procesos: al worker le
+llegan los bytes de la respuesta y devuelve tuplas con los campos de cada
+resultado, así que nunca se serializan objetos de BeautifulSoup ni modelos
+Pydantic entre procesos.
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Union
+
+from .config import get_settings
+from .logging_config import setup_logging
+from .models import EntityResult
+
+logger = logging.getLogger(__name__)
+
+# Orden de los campos en las tuplas que devuelve parse_page
+RESULT_FIELDS = tuple(EntityResult.model_fields)
+
+PARSE_MODES = ("inline", "thread", "process")
+
+
+def parse_page(source_id: str, content: Union[str, bytes], encoding: Optional[str] = None) -> List[tuple]:
+    """
+    Parsea una página de resultados y devuelve tuplas compactas.
+
+    Se ejecuta dentro del executor (también en otro proceso): la fuente se
+    busca en el registro por su id, que en un proceso nuevo se rellena al
+    importar app.sources.
+
+    Args:
+        source_id: Identificador de la fuente
+        content: Página descargada por fetch()
+        encoding: Codificación declarada por el servidor
+
+    Returns:
+        List[tuple]: Un valor por campo de RESULT_FIELDS para cada resultado
+    """
+    from .sources import get_source
+    results = get_source(source_id).parse(content, encoding)
+    return [tuple(getattr(result, name) for name in RESULT_FIELDS) for result in results]
+
+
+def to_results(rows: List[tuple]) -> List[EntityResult]:
+    """
+    Reconstruye los EntityResult a partir de las tuplas de parse_page.
+
+    Los valores ya se validaron al crear los modelos en el worker, así que se
+    usa model_construct para no repetir la validación.
+    """
+    return [EntityResult.model_construct(**dict(zip(RESULT_FIELDS, row))) for row in rows]
+
+
+def create_executor(mode: str, workers: int) -> Optional[Executor]:
+    """
+    Crea el executor de parseo para el modo indicado.
+
+    Args:
+        mode: "inline" (sin executor), "thread" o "process"
+        workers: Número de hilos o procesos
+
+    Returns:
+        Optional[Executor]: None en modo "inline"
+
+    Raises:
+        ValueError: Si el modo no es válido
+    """
+    if mode not in PARSE_MODES:
+        raise ValueError(f"PARSE_EXECUTOR inválido: {mode}. Valores válidos: {', '.join(PARSE_MODES)}")
+    if mode == "inline":
+        return None
+    if mode == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parser")
+    # "spawn" en lugar de fork: el proceso de la API tiene hilos en marcha y
+    # un fork podría heredar locks tomados por ellos
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=setup_logging)
+
+
+_executor: Optional[Executor] = None
+_executor_created = False
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor() -> Optional[Executor]:
+    """
+    Obtiene el executor de parseo compartido, creándolo en el primer uso.
+
+    El modo y el tamaño se toman de PARSE_EXECUTOR y PARSE_WORKERS (por
+    defecto, un worker por CPU).
+    """
+    global _executor, _executor_created
+    if not _executor_created:
+        with _executor_lock:
+            if not _executor_created:
+                _executor = _create_configured_executor()
+                _executor_created = True
+    return _executor
+
+
+def _create_configured_executor() -> Optional[Executor]:
+    settings = get_settings()
+    workers = settings.parse_workers or os.cpu_count() or 1
+    return create_executor(settings.parse_executor, workers)
+
+
+def _replace_broken_executor(broken: Executor):
+    """
+    Sustituye el pool de procesos roto por uno nuevo.
+
+    Un ProcessPoolExecutor queda inutilizable para siempre cuando muere uno de
+    sus procesos (p. ej. por falta de memoria). Si otro hilo ya lo sustituyó,
+    no se hace nada.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            logger.warning("El pool de procesos de parseo se rompió; se crea uno nuevo")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _executor = _create_configured_executor()
+
+
+def parse_content(plugin, content: Union[str, bytes], encoding: Optional[str] = None) -> List[EntityResult]:
+    """
+    Parsea la página de una fuente en el executor configurado.
+
+    Args:
+        plugin: Fuente que descargó la página
+        content: Página descargada por plugin.fetch()
+        encoding: Codificación declarada por el servidor
+
+    Returns:
+        List[EntityResult]: Lista de entidades encontradas
+    """
+    executor = get_parse_executor()
+    if executor is None:
+        return plugin.parse(content, encoding)
+    try:
+        return to_results(executor.submit(parse_page, plugin.id, content, encoding).result())
+    except BrokenProcessPool:
+        # Un solo reintento en un pool nuevo: si la propia página es la que
+        # tumba el proceso, el error llega a search_source como fallo de la fuente
+        _replace_broken_executor(executor)
+        executor = get_parse_executor()
+        try:
+            return to_results(executor.submit(parse_page, plugin.id, content, encoding).result())
+        except BrokenProcessPool:
+            _replace_broken_executor(executor)
+            raise
+
+
+def shutdown_parse_executor():
+    """
+    Detiene el executor de parseo si se llegó a crear.
+    """
+    global _executor, _executor_created
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        _executor_created = False
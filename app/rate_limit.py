@@ -3,9 +3,22 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request
 
+from .config import get_settings
+
 # Configurar el limitador de velocidad
 limiter = Limiter(key_func=get_remote_address)
 
+def search_rate_limit() -> str:
+    """
+    Límite de las búsquedas por IP, configurable con MAX_REQUESTS_PER_MINUTE.
+
+    slowapi lo evalúa en cada petición.
+
+    Returns:
+        str: Límite en el formato de slowapi, p. ej. "20/minute"
+    """
+    return f"{get_settings().max_requests_per_minute}/minute"
+
 def get_rate_limit_info():
     """
     Obtiene información sobre los límites de velocidad configurados.
@@ -13,9 +26,10 @@ def get_rate_limit_info():
     Returns:
         dict: Información sobre los límites de velocidad
     """
+    max_requests = get_settings().max_requests_per_minute
     return {
-        "max_requests_per_minute": 20,
-        "description": "Máximo 20 llamadas por minuto por IP"
+        "max_requests_per_minute": max_requests,
+        "description": f"Máximo {max_requests} llamadas por minuto por IP"
     }
 
 def create_rate_limit_exceeded_response(request: Request, exc: RateLimitExceeded):
@@ -31,7 +45,7 @@ def create_rate_limit_exceeded_response(request: Request, exc: RateLimitExceeded
     """
     return {
         "error": "Rate limit exceeded",
-        "detail": f"Has excedido el límite de {get_rate_limit_info()['max_requests_per_minute']} llamadas por minuto",
-        "retry_after": exc.retry_after,
-        "limit": exc.retry_after
+        "detail": f"Has excedido el límite de {exc.limit.limit.amount} llamadas por minuto",
+        "retry_after": exc.limit.limit.get_expiry(),
+        "limit": exc.detail
     } 
\ No newline at end of file
@@ -1,14 +1,29 @@
 import requests
-from bs4 import BeautifulSoup
+import threading
 import time
-from typing import List, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import List, Dict, Optional, Union
+from .config import get_settings
 from .models import EntityResult, SearchResponse
+from .hedging import hedged_submit, make_pending_token, read_pending_token
+from .logging_config import SAMPLED, describe_error, entity_ref, propagate_request_id
+from .parsing import parse_content
+from .sources import SourcePlugin, resolve_sources
 import logging
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class SourceUnavailable(Exception):
+    """
+    La fuente no se pudo consultar (error de red o de parseo).
+    
+    Se distingue de una búsqueda sin coincidencias: sus resultados no se
+    guardan ni se reutilizan, y la fuente aparece en failed_sources.
+    """
+    def __init__(self, plugin: SourcePlugin):
+        super().__init__(f"No se pudo consultar {plugin.name}")
+        self.plugin = plugin
+
 class WebScraper:
     """
     Clase principal para realizar web scraping en listas de alto riesgo.
@@ -23,290 +38,316 @@ class WebScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
     
-    def search_offshore_leaks(self, entity_name: str) -> List[EntityResult]:
+    def search_source(self, plugin: SourcePlugin, entity_name: str) -> Optional[List[EntityResult]]:
         """
-        Busca una entidad en la Offshore Leaks Database.
+        Busca una entidad en una fuente: descarga la página y la parsea.
         
         Args:
+            plugin: Fuente en la que buscar
             entity_name: Nombre de la entidad a buscar
             
         Returns:
-            List[EntityResult]: Lista de entidades encontradas
+            Optional[List[EntityResult]]: Lista de entidades encontradas, o None si
+                la fuente no se pudo consultar
         """
+        start_time = time.time()
         try:
-            logger.info(f"Buscando '{entity_name}' en Offshore Leaks Database")
-            
-            # URL de búsqueda de Offshore Leaks
-            search_url = "https://offshoreleaks.icij.org/search"
-            
-            # Parámetros de búsqueda
-            params = {
-                'q': entity_name,
-                'cat': '1',  # Buscar en entidades
-                'from': '0',
-                'size': '20'
-            }
-            
-            # Realizar la petición
-            response = self.session.get(search_url, params=params, timeout=30)
-            response.raise_for_status()
+            if get_settings().streaming_parse and plugin.supports_streaming:
+                # Descarga y parseo a la vez: cada fila se procesa al llegar y
+                # no se guarda nunca la página completa en memoria
+                with plugin.semaphore:
+                    results = list(plugin.stream(self.session, entity_name))
+            else:
+                # Limitar las peticiones simultáneas a la fuente
+                with plugin.semaphore:
+                    content, encoding = plugin.fetch(self.session, entity_name)
+                
+                # El parseo se hace en el executor configurado (PARSE_EXECUTOR)
+                results = parse_content(plugin, content, encoding)
             
-            # Parsear el HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Registrar la latencia para decidir cuándo duplicar peticiones
+            elapsed = time.time() - start_time
+            plugin.latency.record(elapsed)
             
-            results = []
-            
-            # Buscar resultados en la página (esto es un ejemplo simplificado)
-            # En una implementación real, necesitarías analizar la estructura específica de la página
-            search_results = soup.find_all('div', class_='search-result')
-            
-            for result in search_results:
-                try:
-                    # Extraer información del resultado
-                    name_elem = result.find('h3', class_='entity-name')
-                    name = name_elem.get_text(strip=True) if name_elem else "N/A"
-                    
-                    jurisdiction_elem = result.find('span', class_='jurisdiction')
-                    jurisdiction = jurisdiction_elem.get_text(strip=True) if jurisdiction_elem else None
-                    
-                    linked_to_elem = result.find('span', class_='linked-to')
-                    linked_to = linked_to_elem.get_text(strip=True) if linked_to_elem else None
-                    
-                    data_from_elem = result.find('span', class_='data-from')
-                    data_from = data_from_elem.get_text(strip=True) if data_from_elem else None
-                    
-                    # Crear el resultado
-                    entity_result = EntityResult(
-                        name=name,
-                        source="Offshore Leaks Database",
-                        jurisdiction=jurisdiction,
-                        linked_to=linked_to,
-                        data_from=data_from,
-                        url=search_url
-                    )
-                    
-                    results.append(entity_result)
-                    
-                except Exception as e:
-                    logger.error(f"Error procesando resultado de Offshore Leaks: {e}")
-                    continue
-            
-            logger.info(f"Encontrados {len(results)} resultados en Offshore Leaks Database")
+            logger.info("Búsqueda completada en %s", plugin.id, extra={
+                **SAMPLED, "source": plugin.id, "entity_ref": entity_ref(entity_name),
+                "hits": len(results), "duration_ms": round(elapsed * 1000, 1),
+            })
             return results
             
         except requests.RequestException as e:
-            logger.error(f"Error de red al buscar en Offshore Leaks: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar en Offshore Leaks: {e}")
-            return []
+            # El mensaje de la excepción lleva la URL con el nombre buscado
+            logger.error("Error de red al buscar en %s: %s", plugin.id, describe_error(e),
+                         extra={"source": plugin.id, "entity_ref": entity_ref(entity_name)})
+            return None
+        except Exception:
+            logger.exception("Error inesperado al buscar en %s", plugin.id,
+                             extra={"source": plugin.id, "entity_ref": entity_ref(entity_name)})
+            return None
+
+# Cada hilo reutiliza su propio scraper (y su pool de conexiones HTTP)
+_local = threading.local()
+
+def get_scraper() -> WebScraper:
+    """
+    Obtiene el scraper del hilo actual, creándolo si no existe.
+    """
+    scraper = getattr(_local, "scraper", None)
+    if scraper is None:
+        scraper = _local.scraper = WebScraper()
+    return scraper
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Obtiene el pool de hilos compartido para consultar las fuentes en paralelo.
+    El tamaño se toma de la configuración (SCRAPER_MAX_WORKERS).
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_settings().scraper_max_workers,
+                    thread_name_prefix="scraper"
+                )
+    return _executor
+
+def _search_in_thread(plugin: SourcePlugin, entity_name: str) -> List[EntityResult]:
+    results = get_scraper().search_source(plugin, entity_name)
+    if results is None:
+        raise SourceUnavailable(plugin)
+    return results
+
+def _save_results(plugin: SourcePlugin, entity_name: str, results: List[EntityResult], store):
+    try:
+        store.save_search(entity_name, plugin.id, results)
+    except Exception as e:
+        logger.error("Error guardando resultados de %s: %s", plugin.id, e,
+                     extra={"source": plugin.id, "entity_ref": entity_ref(entity_name)})
+
+def _save_failure(plugin: SourcePlugin, entity_name: str, store):
+    try:
+        store.save_failure(entity_name, plugin.id)
+    except Exception as e:
+        logger.error("Error registrando el fallo de %s: %s", plugin.id, e,
+                     extra={"source": plugin.id, "entity_ref": entity_ref(entity_name)})
+
+def submit_scrape(plugin: SourcePlugin, entity_name: str, store=None, hedge: bool = False) -> Future:
+    """
+    Lanza en el pool el scraping de una fuente.
     
-    def search_world_bank(self, entity_name: str) -> List[EntityResult]:
-        """
-        Busca una entidad en la lista de firmas debarred del World Bank.
+    Args:
+        plugin: Fuente en la que buscar
+        entity_name: Nombre de la entidad a buscar
+        store: Almacén de resultados donde persistir el scraping
+        hedge: Si es True y el primer intento tarda más que el p95 observado de la
+            fuente, se lanza una petición duplicada y se usa la primera que termine
         
-        Args:
-            entity_name: Nombre de la entidad a buscar
-            
-        Returns:
-            List[EntityResult]: Lista de entidades encontradas
-        """
-        try:
-            logger.info(f"Buscando '{entity_name}' en World Bank Debarred Firms")
-            
-            # URL de búsqueda del World Bank
-            search_url = "https://projects.worldbank.org/en/projects-operations/procurement/debarred-firms"
-            
-            # Parámetros de búsqueda
-            params = {
-                'search': entity_name
-            }
-            
-            # Realizar la petición
-            response = self.session.get(search_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Parsear el HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            results = []
-            
-            # Buscar resultados en la página (ejemplo simplificado)
-            search_results = soup.find_all('tr', class_='debarred-firm')
-            
-            for result in search_results:
-                try:
-                    # Extraer información del resultado
-                    cells = result.find_all('td')
-                    if len(cells) >= 4:
-                        firm_name = cells[0].get_text(strip=True) if cells[0] else "N/A"
-                        address = cells[1].get_text(strip=True) if len(cells) > 1 and cells[1] else None
-                        country = cells[2].get_text(strip=True) if len(cells) > 2 and cells[2] else None
-                        from_date = cells[3].get_text(strip=True) if len(cells) > 3 and cells[3] else None
-                        to_date = cells[4].get_text(strip=True) if len(cells) > 4 and cells[4] else None
-                        grounds = cells[5].get_text(strip=True) if len(cells) > 5 and cells[5] else None
-                        
-                        # Crear el resultado
-                        entity_result = EntityResult(
-                            name=firm_name,
-                            source="World Bank Debarred Firms",
-                            address=address,
-                            country=country,
-                            from_date=from_date,
-                            to_date=to_date,
-                            grounds=grounds,
-                            url=search_url
-                        )
-                        
-                        results.append(entity_result)
-                        
-                except Exception as e:
-                    logger.error(f"Error procesando resultado del World Bank: {e}")
-                    continue
-            
-            logger.info(f"Encontrados {len(results)} resultados en World Bank")
-            return results
-            
-        except requests.RequestException as e:
-            logger.error(f"Error de red al buscar en World Bank: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar en World Bank: {e}")
-            return []
+    Returns:
+        Future: Se completa con la lista de EntityResult, o con SourceUnavailable
+            si la fuente no se pudo consultar
+    """
+    if not hedge:
+        return get_executor().submit(propagate_request_id(scrape_source), plugin, entity_name, store)
     
-    def search_ofac(self, entity_name: str) -> List[EntityResult]:
-        """
-        Busca una entidad en la lista de sanciones de OFAC.
+    future = hedged_submit(
+        get_executor(),
+        propagate_request_id(lambda: _search_in_thread(plugin, entity_name)),
+        hedge_after=plugin.latency.p95()
+    )
+    if store is not None:
+        def save_when_done(done: Future):
+            if done.exception() is None:
+                _save_results(plugin, entity_name, done.result(), store)
+            else:
+                _save_failure(plugin, entity_name, store)
         
-        Args:
-            entity_name: Nombre de la entidad a buscar
-            
-        Returns:
-            List[EntityResult]: Lista de entidades encontradas
-        """
-        try:
-            logger.info(f"Buscando '{entity_name}' en OFAC Sanctions")
-            
-            # URL de búsqueda de OFAC
-            search_url = "https://sanctionssearch.ofac.treas.gov"
-            
-            # Parámetros de búsqueda
-            params = {
-                'name': entity_name
-            }
-            
-            # Realizar la petición
-            response = self.session.get(search_url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # Parsear el HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            results = []
-            
-            # Buscar resultados en la página (ejemplo simplificado)
-            search_results = soup.find_all('div', class_='sanctioned-entity')
-            
-            for result in search_results:
-                try:
-                    # Extraer información del resultado
-                    name_elem = result.find('span', class_='entity-name')
-                    name = name_elem.get_text(strip=True) if name_elem else "N/A"
-                    
-                    address_elem = result.find('span', class_='address')
-                    address = address_elem.get_text(strip=True) if address_elem else None
-                    
-                    entity_type_elem = result.find('span', class_='entity-type')
-                    entity_type = entity_type_elem.get_text(strip=True) if entity_type_elem else None
-                    
-                    programs_elem = result.find('span', class_='programs')
-                    programs = programs_elem.get_text(strip=True) if programs_elem else None
-                    
-                    list_name_elem = result.find('span', class_='list-name')
-                    list_name = list_name_elem.get_text(strip=True) if list_name_elem else None
-                    
-                    score_elem = result.find('span', class_='score')
-                    score = score_elem.get_text(strip=True) if score_elem else None
-                    
-                    # Crear el resultado
-                    entity_result = EntityResult(
-                        name=name,
-                        source="OFAC Sanctions",
-                        address=address,
-                        entity_type=entity_type,
-                        programs=programs,
-                        list_name=list_name,
-                        score=score,
-                        url=search_url
-                    )
-                    
-                    results.append(entity_result)
-                    
-                except Exception as e:
-                    logger.error(f"Error procesando resultado de OFAC: {e}")
-                    continue
-            
-            logger.info(f"Encontrados {len(results)} resultados en OFAC")
-            return results
-            
-        except requests.RequestException as e:
-            logger.error(f"Error de red al buscar en OFAC: {e}")
-            return []
-        except Exception as e:
-            logger.error(f"Error inesperado al buscar en OFAC: {e}")
-            return []
+        future.add_done_callback(save_when_done)
+    return future
+
+def scrape_source(plugin: SourcePlugin, entity_name: str, store=None) -> List[EntityResult]:
+    """
+    Hace scraping de una fuente y, si se indica, guarda los resultados.
+    
+    Args:
+        plugin: Fuente en la que buscar
+        entity_name: Nombre de la entidad a buscar
+        store: Almacén de resultados (ResultStore) donde persistir el scraping
+        
+    Returns:
+        List[EntityResult]: Lista de entidades encontradas
+        
+    Raises:
+        SourceUnavailable: Si la fuente no se pudo consultar; el fallo se registra
+            en el almacén, pero no como una búsqueda sin resultados
+    """
+    try:
+        results = _search_in_thread(plugin, entity_name)
+    except SourceUnavailable:
+        if store is not None:
+            _save_failure(plugin, entity_name, store)
+        raise
+    if store is not None:
+        _save_results(plugin, entity_name, results, store)
+    return results
 
-def search_entity(entity_name: str, source: str = "all") -> SearchResponse:
+def search_entity(entity_name: str, source: Union[str, List[str]] = "all", store=None,
+                  max_age: Optional[float] = None,
+                  latency_budget: Optional[float] = None) -> SearchResponse:
     """
     Función principal para buscar una entidad en las listas de alto riesgo.
     
+    Las fuentes seleccionadas se consultan en paralelo.
+    
     Args:
         entity_name: Nombre de la entidad a buscar
-        source: Fuente específica para buscar ("offshore_leaks", "world_bank", "ofac", "all")
+        source: "all", el id de una fuente o una lista de ids
+        store: Almacén de resultados (ResultStore) donde persistir cada scraping
+        max_age: Si se indica junto con store, las fuentes con datos guardados más
+            recientes que max_age segundos se responden desde el almacén sin scraping
+        latency_budget: Tiempo máximo de respuesta en segundos. Activa las peticiones
+            duplicadas (hedging) y, al agotarse, devuelve las fuentes terminadas y
+            marca el resto como pendientes con un token para recuperarlas después
         
     Returns:
         SearchResponse: Respuesta con los resultados de la búsqueda
+        
+    Raises:
+        ValueError: Si alguna de las fuentes indicadas no existe
     """
     start_time = time.time()
-    scraper = WebScraper()
+    deadline = start_time + latency_budget if latency_budget is not None else None
+    plugins = resolve_sources(source)
     all_results = []
     sources_searched = []
+    cached_sources = []
+    pending_plugins = []
+    failed_sources = []
     
     try:
-        # Determinar qué fuentes buscar
-        if source == "all" or source == "offshore_leaks":
-            results = scraper.search_offshore_leaks(entity_name)
-            all_results.extend(results)
-            sources_searched.append("Offshore Leaks Database")
-        
-        if source == "all" or source == "world_bank":
-            results = scraper.search_world_bank(entity_name)
-            all_results.extend(results)
-            sources_searched.append("World Bank Debarred Firms")
+        # Responder desde el almacén las fuentes con datos recientes
+        # y lanzar en paralelo el scraping de las demás
+        pending = {}
+        for plugin in plugins:
+            results = None
+            if store is not None and max_age is not None:
+                results = store.get_fresh(entity_name, plugin.id, max_age)
+            
+            if results is not None:
+                cached_sources.append(plugin.name)
+                pending[plugin.id] = results
+            else:
+                pending[plugin.id] = submit_scrape(
+                    plugin, entity_name, store, hedge=latency_budget is not None
+                )
         
-        if source == "all" or source == "ofac":
-            results = scraper.search_ofac(entity_name)
+        # Reunir los resultados en orden de prioridad
+        for plugin in plugins:
+            results = pending[plugin.id]
+            if not isinstance(results, list):
+                timeout = max(0.0, deadline - time.time()) if deadline is not None else None
+                try:
+                    results = results.result(timeout=timeout)
+                except FutureTimeout:
+                    # Presupuesto agotado: la fuente sigue en curso y se guardará al terminar
+                    pending_plugins.append(plugin)
+                    continue
+                except SourceUnavailable:
+                    # Un fallo no es una búsqueda sin coincidencias: se informa aparte
+                    failed_sources.append(plugin.name)
+                    continue
             all_results.extend(results)
-            sources_searched.append("OFAC Sanctions")
+            sources_searched.append(plugin.name)
         
         search_time = time.time() - start_time
         
+        pending_token = None
+        if pending_plugins and store is not None:
+            reference = store.save_pending(
+                entity_name,
+                [plugin.id for plugin in pending_plugins],
+                issued_at=start_time
+            )
+            pending_token = make_pending_token(reference, get_settings().api_token)
+        
         return SearchResponse(
             entity_name=entity_name,
             total_hits=len(all_results),
             search_time=search_time,
             sources_searched=sources_searched,
+            cached_sources=cached_sources,
+            pending_sources=[plugin.name for plugin in pending_plugins],
+            pending_token=pending_token,
+            failed_sources=failed_sources,
             results=all_results
         )
         
-    except Exception as e:
-        logger.error(f"Error general en la búsqueda: {e}")
+    except Exception:
+        logger.exception("Error general en la búsqueda", extra={"entity_ref": entity_ref(entity_name)})
         search_time = time.time() - start_time
         
         return SearchResponse(
             entity_name=entity_name,
             total_hits=0,
             search_time=search_time,
-            sources_searched=sources_searched,
+            sources_searched=[],
+            failed_sources=[plugin.name for plugin in plugins],
             results=[]
-        ) 
\ No newline at end of file
+        )
+
+def get_pending_results(token: str, store) -> SearchResponse:
+    """
+    Recupera los resultados de las fuentes que quedaron pendientes en una búsqueda
+    con presupuesto de latencia.
+    
+    Los resultados tardíos se guardan en el almacén al terminar, así que se leen
+    de ahí (cualquier worker puede responder).
+    
+    Args:
+        token: Token devuelto en pending_token
+        store: Almacén de resultados
+        
+    Returns:
+        SearchResponse: Resultados de las fuentes ya terminadas; las que siguen en
+            curso aparecen en pending_sources con el mismo token y las que fallaron,
+            en failed_sources
+        
+    Raises:
+        ValueError: Si el token no es válido o ha caducado
+    """
+    start_time = time.time()
+    data = store.get_pending(read_pending_token(token, get_settings().api_token))
+    if data is None:
+        raise ValueError("Token de resultados pendientes caducado o desconocido")
+    entity_name = data["entity_name"]
+    max_age = start_time - data["issued_at"]
+    
+    all_results = []
+    sources_searched = []
+    pending_sources = []
+    failed_sources = []
+    for plugin in resolve_sources(data["sources"]):
+        results = store.get_fresh(entity_name, plugin.id, max_age)
+        if results is None:
+            if store.failed_since(entity_name, plugin.id, data["issued_at"]):
+                failed_sources.append(plugin.name)
+            else:
+                pending_sources.append(plugin.name)
+            continue
+        all_results.extend(results)
+        sources_searched.append(plugin.name)
+    
+    return SearchResponse(
+        entity_name=entity_name,
+        total_hits=len(all_results),
+        search_time=time.time() - start_time,
+        sources_searched=sources_searched,
+        cached_sources=sources_searched,
+        pending_sources=pending_sources,
+        pending_token=token if pending_sources else None,
+        failed_sources=failed_sources,
+        results=all_results
+    )
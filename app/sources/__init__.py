@@ -0,0 +1,220 @@
+"""
+Registro de fuentes de búsqueda (plugins).
+
+Cada módulo de este paquete declara una fuente con register_source(). Los
+módulos se descubren automáticamente al importar el paquete, así que añadir
+una fuente nueva consiste en crear un módulo aquí.
+"""
+
+import importlib
+import logging
+import pkgutil
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from ..hedging import LatencyStats
+from ..models import EntityResult
+from ..streaming import RowSpec, iter_rows
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourcePlugin:
+    """
+    Declaración de una fuente de búsqueda.
+
+    Attributes:
+        id: Identificador usado en las peticiones (p. ej. "ofac")
+        name: Nombre legible, usado en EntityResult.source y sources_searched
+        url: URL pública de la fuente
+        description: Descripción para el endpoint /sources
+        attributes: Atributos que devuelve la fuente
+        fetch: Función (session, entity_name) -> (HTML en bytes, codificación
+            declarada por el servidor o None)
+        parse: Función (html, encoding=None) -> lista de EntityResult; debe ser
+            una función de módulo para poder ejecutarse en el pool de procesos de parseo
+        concurrency: Peticiones simultáneas máximas a la fuente por proceso
+        ttl: Segundos que los resultados pueden reutilizarse desde cachés HTTP
+        priority: Orden de la fuente en las respuestas (menor primero)
+        fetch_stream: Función (session, entity_name) -> bloques de texto de la
+            página, para el modo streaming (opcional)
+        rows: Descripción de las filas de resultados para el parseo incremental
+        from_row: Función (tupla de textos de una fila) -> EntityResult
+    """
+    id: str
+    name: str
+    url: str
+    description: str
+    attributes: List[str]
+    fetch: Callable[..., Tuple[bytes, Optional[str]]]
+    parse: Callable[..., List[EntityResult]]
+    concurrency: int = 4
+    ttl: int = 3600
+    priority: int = 100
+    fetch_stream: Optional[Callable[..., Iterator[str]]] = None
+    rows: Optional[RowSpec] = None
+    from_row: Optional[Callable[[tuple], EntityResult]] = None
+    semaphore: threading.BoundedSemaphore = field(init=False, repr=False, compare=False)
+    latency: LatencyStats = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.semaphore = threading.BoundedSemaphore(self.concurrency)
+        self.latency = LatencyStats()
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.fetch_stream is not None and self.rows is not None and self.from_row is not None
+
+    def stream(self, session, entity_name: str) -> Iterator[EntityResult]:
+        """
+        Descarga y parsea la página a la vez, sin construir el árbol completo.
+
+        Cada resultado se genera en cuanto se cierra su fila en el HTML.
+
+        Args:
+            session: Sesión HTTP (requests.Session)
+            entity_name: Nombre de la entidad a buscar
+
+        Yields:
+            EntityResult: Entidades encontradas
+        """
+        for values in iter_rows(self.rows, self.fetch_stream(session, entity_name)):
+            try:
+                result = self.from_row(values)
+            except Exception as e:
+                logger.error("Error procesando resultado de %s: %s", self.id, e)
+                continue
+            if result is not None:
+                yield result
+
+    def describe(self) -> dict:
+        """
+        Devuelve la descripción pública de la fuente (endpoint /sources).
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "url": self.url,
+            "description": self.description,
+            "attributes": self.attributes,
+            "ttl": self.ttl,
+        }
+
+
+_registry: Dict[str, SourcePlugin] = {}
+
+
+def make_soup(html: Union[str, bytes], encoding: Optional[str] = None):
+    """
+    Construye el árbol de BeautifulSoup de una página de resultados.
+
+    Args:
+        html: HTML de la página (texto o bytes sin decodificar)
+        encoding: Codificación declarada por el servidor (sólo para bytes)
+    """
+    # BeautifulSoup se importa en el primer uso
+    from bs4 import BeautifulSoup
+    if isinstance(html, bytes):
+        return BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+    return BeautifulSoup(html, 'html.parser')
+
+
+def register_source(plugin: SourcePlugin) -> SourcePlugin:
+    """
+    Registra una fuente de búsqueda.
+
+    Args:
+        plugin: Declaración de la fuente
+
+    Returns:
+        SourcePlugin: La misma fuente, ya registrada
+
+    Raises:
+        ValueError: Si ya existe una fuente con el mismo id
+    """
+    if plugin.id == "all":
+        raise ValueError("'all' es un identificador reservado")
+    if plugin.id in _registry:
+        raise ValueError(f"La fuente '{plugin.id}' ya está registrada")
+    _registry[plugin.id] = plugin
+    return plugin
+
+
+def get_source(source_id: str) -> SourcePlugin:
+    """
+    Obtiene una fuente por su identificador.
+
+    Raises:
+        KeyError: Si la fuente no existe
+    """
+    return _registry[source_id]
+
+
+def available_sources() -> List[SourcePlugin]:
+    """
+    Devuelve todas las fuentes registradas ordenadas por prioridad.
+    """
+    return sorted(_registry.values(), key=lambda plugin: (plugin.priority, plugin.id))
+
+
+def valid_source_ids() -> List[str]:
+    """
+    Devuelve los valores aceptados en el campo source ("all" y cada id).
+    """
+    return ["all"] + [plugin.id for plugin in available_sources()]
+
+
+def resolve_sources(source: Union[str, List[str], None] = "all") -> List[SourcePlugin]:
+    """
+    Convierte el campo source de una petición en la lista de fuentes a buscar.
+
+    Args:
+        source: "all", un id, una lista de ids o varios ids separados por comas
+
+    Returns:
+        List[SourcePlugin]: Fuentes seleccionadas, sin duplicados y ordenadas por prioridad
+
+    Raises:
+        ValueError: Si alguna fuente no existe o la lista está vacía
+    """
+    if source is None:
+        source = "all"
+    if isinstance(source, str):
+        source = source.split(",")
+
+    ids = [item.strip() for item in source if item.strip()]
+    if not ids:
+        raise ValueError("Debe indicarse al menos una fuente")
+    if "all" in ids:
+        return available_sources()
+
+    invalid = [source_id for source_id in ids if source_id not in _registry]
+    if invalid:
+        raise ValueError(
+            f"Fuente inválida: {', '.join(invalid)}. "
+            f"Fuentes válidas: {', '.join(valid_source_ids())}"
+        )
+
+    selected = {source_id: _registry[source_id] for source_id in ids}
+    return sorted(selected.values(), key=lambda plugin: (plugin.priority, plugin.id))
+
+
+def cache_ttl(plugins: List[SourcePlugin]) -> int:
+    """
+    TTL de caché HTTP de una búsqueda: el más corto de las fuentes consultadas.
+    """
+    return min(plugin.ttl for plugin in plugins)
+
+
+def _discover():
+    """
+    Importa todos los módulos del paquete para que registren sus fuentes.
+    """
+    for module in pkgutil.iter_modules(__path__):
+        if not module.name.startswith("_"):
+            importlib.import_module(f"{__name__}.{module.name}")
+
+
+_discover()
@@ -0,0 +1,151 @@
+import logging
+from typing import List, Optional, Tuple, Union
+
+from ..models import EntityResult
+from ..streaming import RowSpec, declared_encoding, stream_text
+from . import SourcePlugin, make_soup, register_source
+
+logger = logging.getLogger(__name__)
+
+# URL de búsqueda de OFAC
+SEARCH_URL = "https://sanctionssearch.ofac.treas.gov"
+
+
+def _params(entity_name: str) -> dict:
+    # Parámetros de búsqueda
+    return {
+        'name': entity_name
+    }
+
+
+def fetch(session, entity_name: str) -> Tuple[bytes, Optional[str]]:
+    """
+    Descarga la página de resultados de la lista de sanciones de OFAC.
+    
+    Args:
+        session: Sesión HTTP (requests.Session)
+        entity_name: Nombre de la entidad a buscar
+        
+    Returns:
+        Tuple[bytes, Optional[str]]: HTML de la página sin decodificar y la
+            codificación declarada en Content-Type (None si no la indica)
+    """
+    response = session.get(SEARCH_URL, params=_params(entity_name), timeout=30)
+    response.raise_for_status()
+    return response.content, declared_encoding(response)
+
+
+def fetch_stream(session, entity_name: str):
+    """
+    Descarga la página de resultados de OFAC por bloques (modo streaming).
+    """
+    return stream_text(session, SEARCH_URL, _params(entity_name))
+
+
+def parse(html: Union[str, bytes], encoding: Optional[str] = None) -> List[EntityResult]:
+    """
+    Extrae las entidades sancionadas de la página de resultados de OFAC.
+    
+    Args:
+        html: HTML de la página de resultados (texto o bytes sin decodificar)
+        encoding: Codificación declarada por el servidor, para decodificar los bytes
+        
+    Returns:
+        List[EntityResult]: Lista de entidades encontradas
+    """
+    soup = make_soup(html, encoding)
+    
+    results = []
+    
+    # Buscar resultados en la página (ejemplo simplificado)
+    search_results = soup.find_all('div', class_='sanctioned-entity')
+    
+    for result in search_results:
+        try:
+            # Extraer información del resultado
+            name_elem = result.find('span', class_='entity-name')
+            name = name_elem.get_text(strip=True) if name_elem else "N/A"
+            
+            address_elem = result.find('span', class_='address')
+            address = address_elem.get_text(strip=True) if address_elem else None
+            
+            entity_type_elem = result.find('span', class_='entity-type')
+            entity_type = entity_type_elem.get_text(strip=True) if entity_type_elem else None
+            
+            programs_elem = result.find('span', class_='programs')
+            programs = programs_elem.get_text(strip=True) if programs_elem else None
+            
+            list_name_elem = result.find('span', class_='list-name')
+            list_name = list_name_elem.get_text(strip=True) if list_name_elem else None
+            
+            score_elem = result.find('span', class_='score')
+            score = score_elem.get_text(strip=True) if score_elem else None
+            
+            # Crear el resultado
+            entity_result = EntityResult(
+                name=name,
+                source="OFAC Sanctions",
+                address=address,
+                entity_type=entity_type,
+                programs=programs,
+                list_name=list_name,
+                score=score,
+                url=SEARCH_URL
+            )
+            
+            results.append(entity_result)
+            
+        except Exception as e:
+            logger.error("Error procesando resultado de OFAC: %s", e)
+            continue
+    
+    return results
+
+
+# Filas de resultados para el parseo incremental (mismos selectores que parse)
+ROWS = RowSpec(
+    tag='div',
+    css_class='sanctioned-entity',
+    fields=(
+        ('span', 'entity-name'),
+        ('span', 'address'),
+        ('span', 'entity-type'),
+        ('span', 'programs'),
+        ('span', 'list-name'),
+        ('span', 'score'),
+    ),
+)
+
+
+def from_row(values: tuple) -> EntityResult:
+    """
+    Construye el resultado a partir de los campos de una fila (modo streaming).
+    """
+    name, address, entity_type, programs, list_name, score = values
+    return EntityResult(
+        name=name if name is not None else "N/A",
+        source="OFAC Sanctions",
+        address=address,
+        entity_type=entity_type,
+        programs=programs,
+        list_name=list_name,
+        score=score,
+        url=SEARCH_URL
+    )
+
+
+register_source(SourcePlugin(
+    id="ofac",
+    name="OFAC Sanctions",
+    url="https://sanctionssearch.ofac.treas.gov",
+    description="Lista de sanciones de la Oficina de Control de Activos Extranjeros",
+    attributes=["Name", "Address", "Type", "Program(s)", "List", "Score"],
+    fetch=fetch,
+    parse=parse,
+    fetch_stream=fetch_stream,
+    rows=ROWS,
+    from_row=from_row,
+    concurrency=4,
+    ttl=3600,  # La lista de sanciones se actualiza con frecuencia
+    priority=30,
+))
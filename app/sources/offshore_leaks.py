@@ -0,0 +1,143 @@
+import logging
+from typing import List, Optional, Tuple, Union
+
+from ..models import EntityResult
+from ..streaming import RowSpec, declared_encoding, stream_text
+from . import SourcePlugin, make_soup, register_source
+
+logger = logging.getLogger(__name__)
+
+# URL de búsqueda de Offshore Leaks
+SEARCH_URL = "https://offshoreleaks.icij.org/search"
+
+
+def _params(entity_name: str) -> dict:
+    # Parámetros de búsqueda
+    return {
+        'q': entity_name,
+        'cat': '1',  # Buscar en entidades
+        'from': '0',
+        'size': '20'
+    }
+
+
+def fetch(session, entity_name: str) -> Tuple[bytes, Optional[str]]:
+    """
+    Descarga la página de resultados de Offshore Leaks.
+    
+    Args:
+        session: Sesión HTTP (requests.Session)
+        entity_name: Nombre de la entidad a buscar
+        
+    Returns:
+        Tuple[bytes, Optional[str]]: HTML de la página sin decodificar y la
+            codificación declarada en Content-Type (None si no la indica)
+    """
+    response = session.get(SEARCH_URL, params=_params(entity_name), timeout=30)
+    response.raise_for_status()
+    return response.content, declared_encoding(response)
+
+
+def fetch_stream(session, entity_name: str):
+    """
+    Descarga la página de resultados de Offshore Leaks por bloques (modo streaming).
+    """
+    return stream_text(session, SEARCH_URL, _params(entity_name))
+
+
+def parse(html: Union[str, bytes], encoding: Optional[str] = None) -> List[EntityResult]:
+    """
+    Extrae las entidades de la página de resultados de Offshore Leaks.
+    
+    Args:
+        html: HTML de la página de resultados (texto o bytes sin decodificar)
+        encoding: Codificación declarada por el servidor, para decodificar los bytes
+        
+    Returns:
+        List[EntityResult]: Lista de entidades encontradas
+    """
+    soup = make_soup(html, encoding)
+    
+    results = []
+    
+    # Buscar resultados en la página (esto es un ejemplo simplificado)
+    # En una implementación real, necesitarías analizar la estructura específica de la página
+    search_results = soup.find_all('div', class_='search-result')
+    
+    for result in search_results:
+        try:
+            # Extraer información del resultado
+            name_elem = result.find('h3', class_='entity-name')
+            name = name_elem.get_text(strip=True) if name_elem else "N/A"
+            
+            jurisdiction_elem = result.find('span', class_='jurisdiction')
+            jurisdiction = jurisdiction_elem.get_text(strip=True) if jurisdiction_elem else None
+            
+            linked_to_elem = result.find('span', class_='linked-to')
+            linked_to = linked_to_elem.get_text(strip=True) if linked_to_elem else None
+            
+            data_from_elem = result.find('span', class_='data-from')
+            data_from = data_from_elem.get_text(strip=True) if data_from_elem else None
+            
+            # Crear el resultado
+            entity_result = EntityResult(
+                name=name,
+                source="Offshore Leaks Database",
+                jurisdiction=jurisdiction,
+                linked_to=linked_to,
+                data_from=data_from,
+                url=SEARCH_URL
+            )
+            
+            results.append(entity_result)
+            
+        except Exception as e:
+            logger.error("Error procesando resultado de Offshore Leaks: %s", e)
+            continue
+    
+    return results
+
+
+# Filas de resultados para el parseo incremental (mismos selectores que parse)
+ROWS = RowSpec(
+    tag='div',
+    css_class='search-result',
+    fields=(
+        ('h3', 'entity-name'),
+        ('span', 'jurisdiction'),
+        ('span', 'linked-to'),
+        ('span', 'data-from'),
+    ),
+)
+
+
+def from_row(values: tuple) -> EntityResult:
+    """
+    Construye el resultado a partir de los campos de una fila (modo streaming).
+    """
+    name, jurisdiction, linked_to, data_from = values
+    return EntityResult(
+        name=name if name is not None else "N/A",
+        source="Offshore Leaks Database",
+        jurisdiction=jurisdiction,
+        linked_to=linked_to,
+        data_from=data_from,
+        url=SEARCH_URL
+    )
+
+
+register_source(SourcePlugin(
+    id="offshore_leaks",
+    name="Offshore Leaks Database",
+    url="https://offshoreleaks.icij.org",
+    description="Base de datos de entidades offshore y jurisdicciones",
+    attributes=["Entity", "Jurisdiction", "Linked To", "Data From"],
+    fetch=fetch,
+    parse=parse,
+    fetch_stream=fetch_stream,
+    rows=ROWS,
+    from_row=from_row,
+    concurrency=4,
+    ttl=86400,  # Conjunto de datos histórico, cambia muy poco
+    priority=10,
+))
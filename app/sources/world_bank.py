@@ -0,0 +1,135 @@
+import logging
+from typing import List, Optional, Tuple, Union
+
+from ..models import EntityResult
+from ..streaming import RowSpec, declared_encoding, stream_text
+from . import SourcePlugin, make_soup, register_source
+
+logger = logging.getLogger(__name__)
+
+# URL de búsqueda del World Bank
+SEARCH_URL = "https://projects.worldbank.org/en/projects-operations/procurement/debarred-firms"
+
+
+def _params(entity_name: str) -> dict:
+    # Parámetros de búsqueda
+    return {
+        'search': entity_name
+    }
+
+
+def fetch(session, entity_name: str) -> Tuple[bytes, Optional[str]]:
+    """
+    Descarga la página de firmas debarred del World Bank.
+    
+    Args:
+        session: Sesión HTTP (requests.Session)
+        entity_name: Nombre de la entidad a buscar
+        
+    Returns:
+        Tuple[bytes, Optional[str]]: HTML de la página sin decodificar y la
+            codificación declarada en Content-Type (None si no la indica)
+    """
+    response = session.get(SEARCH_URL, params=_params(entity_name), timeout=30)
+    response.raise_for_status()
+    return response.content, declared_encoding(response)
+
+
+def fetch_stream(session, entity_name: str):
+    """
+    Descarga la página de firmas debarred del World Bank por bloques (modo streaming).
+    """
+    return stream_text(session, SEARCH_URL, _params(entity_name))
+
+
+def parse(html: Union[str, bytes], encoding: Optional[str] = None) -> List[EntityResult]:
+    """
+    Extrae las firmas de la página de resultados del World Bank.
+    
+    Args:
+        html: HTML de la página de resultados (texto o bytes sin decodificar)
+        encoding: Codificación declarada por el servidor, para decodificar los bytes
+        
+    Returns:
+        List[EntityResult]: Lista de entidades encontradas
+    """
+    soup = make_soup(html, encoding)
+    
+    results = []
+    
+    # Buscar resultados en la página (ejemplo simplificado)
+    search_results = soup.find_all('tr', class_='debarred-firm')
+    
+    for result in search_results:
+        try:
+            # Extraer información del resultado
+            cells = result.find_all('td')
+            if len(cells) >= 4:
+                firm_name = cells[0].get_text(strip=True) if cells[0] else "N/A"
+                address = cells[1].get_text(strip=True) if len(cells) > 1 and cells[1] else None
+                country = cells[2].get_text(strip=True) if len(cells) > 2 and cells[2] else None
+                from_date = cells[3].get_text(strip=True) if len(cells) > 3 and cells[3] else None
+                to_date = cells[4].get_text(strip=True) if len(cells) > 4 and cells[4] else None
+                grounds = cells[5].get_text(strip=True) if len(cells) > 5 and cells[5] else None
+                
+                # Crear el resultado
+                entity_result = EntityResult(
+                    name=firm_name,
+                    source="World Bank Debarred Firms",
+                    address=address,
+                    country=country,
+                    from_date=from_date,
+                    to_date=to_date,
+                    grounds=grounds,
+                    url=SEARCH_URL
+                )
+                
+                results.append(entity_result)
+                
+        except Exception as e:
+            logger.error("Error procesando resultado del World Bank: %s", e)
+            continue
+    
+    return results
+
+
+# Filas de resultados para el parseo incremental: celdas <td> posicionales
+ROWS = RowSpec(tag='tr', css_class='debarred-firm', cells='td')
+
+
+def from_row(cells: tuple) -> Optional[EntityResult]:
+    """
+    Construye el resultado a partir de las celdas de una fila (modo streaming).
+    Las filas con menos de 4 celdas se ignoran, igual que en parse.
+    """
+    if len(cells) < 4:
+        return None
+    cells = cells + (None,) * (6 - len(cells))
+    firm_name, address, country, from_date, to_date, grounds = cells[:6]
+    return EntityResult(
+        name=firm_name,
+        source="World Bank Debarred Firms",
+        address=address,
+        country=country,
+        from_date=from_date,
+        to_date=to_date,
+        grounds=grounds,
+        url=SEARCH_URL
+    )
+
+
+register_source(SourcePlugin(
+    id="world_bank",
+    name="World Bank Debarred Firms",
+    url="https://projects.worldbank.org/en/projects-operations/procurement/debarred-firms",
+    description="Lista de firmas ineligibles para contratos del Banco Mundial",
+    attributes=["Firm Name", "Address", "Country", "From Date", "To Date", "Grounds"],
+    fetch=fetch,
+    parse=parse,
+    fetch_stream=fetch_stream,
+    rows=ROWS,
+    from_row=from_row,
+    concurrency=4,
+    ttl=21600,
+    priority=20,
+))
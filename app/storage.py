@@ -0,0 +1,440 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Dict, Any
+
+from .config import get_settings
+from .models import EntityResult
+
+# Campos de EntityResult que se guardan como columnas en la base de datos
+ENTITY_FIELDS = list(EntityResult.model_fields.keys())
+
+# Campos indexados en el índice de texto completo (FTS5)
+FTS_FIELDS = ["name", "jurisdiction", "address", "country", "linked_to", "grounds", "programs"]
+
+# Segundos durante los que se puede consultar una búsqueda con fuentes pendientes
+PENDING_SEARCH_TTL = 86400
+
+
+def normalize_query(entity_name: str) -> str:
+    """
+    Normaliza el nombre buscado para usarlo como clave de búsqueda.
+
+    Args:
+        entity_name: Nombre de la entidad tal como lo envió el cliente
+
+    Returns:
+        str: Nombre en minúsculas y con los espacios colapsados
+    """
+    return " ".join(entity_name.lower().split())
+
+
+def result_key(result: EntityResult) -> str:
+    """
+    Genera la clave única de un resultado dentro de su fuente.
+    """
+    values = [result.source] + [
+        normalize_query(getattr(result, field) or "")
+        for field in ENTITY_FIELDS
+        if field not in ("source", "url")
+    ]
+    return "\x1f".join(values)
+
+
+def _fts_query(text: str) -> str:
+    """
+    Convierte texto libre en una consulta FTS5 segura (cada término entre comillas).
+    """
+    terms = [term.replace('"', '""') for term in text.split()]
+    return " ".join(f'"{term}"' for term in terms)
+
+
+class ResultStore:
+    """
+    Almacén persistente de resultados de búsqueda en SQLite con índice FTS5.
+
+    Cada scraping de una fuente se registra como una búsqueda (histórico para
+    auditoría) y las entidades encontradas se insertan o actualizan (upsert) en
+    una tabla indexada para consultas de texto completo.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Abre (o crea) la base de datos y su esquema.
+
+        Args:
+            db_path: Ruta del archivo SQLite (":memory:" para una base en memoria)
+        """
+        if db_path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._create_schema()
+
+    def _create_schema(self):
+        """
+        Crea las tablas, el índice FTS5 y los triggers de sincronización.
+        """
+        columns = ",\n                ".join(f"{field} TEXT" for field in ENTITY_FIELDS)
+        fts_columns = ", ".join(FTS_FIELDS)
+        new_values = ", ".join(f"new.{field}" for field in FTS_FIELDS)
+        old_values = ", ".join(f"old.{field}" for field in FTS_FIELDS)
+
+        with self._lock, self._conn:
+            if self.db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS entities (
+                id INTEGER PRIMARY KEY,
+                result_key TEXT NOT NULL UNIQUE,
+                {columns},
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS searches (
+                id INTEGER PRIMARY KEY,
+                query_key TEXT NOT NULL,
+                entity_name TEXT NOT NULL,
+                source TEXT NOT NULL,
+                searched_at REAL NOT NULL,
+                total_hits INTEGER NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_searches_lookup
+                ON searches (query_key, source, searched_at);
+
+            CREATE INDEX IF NOT EXISTS idx_searches_time
+                ON searches (source, searched_at);
+
+            CREATE TABLE IF NOT EXISTS search_failures (
+                id INTEGER PRIMARY KEY,
+                query_key TEXT NOT NULL,
+                source TEXT NOT NULL,
+                failed_at REAL NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_search_failures_lookup
+                ON search_failures (query_key, source, failed_at);
+
+            CREATE TABLE IF NOT EXISTS pending_searches (
+                id TEXT PRIMARY KEY,
+                entity_name TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                issued_at REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS search_hits (
+                search_id INTEGER NOT NULL REFERENCES searches(id),
+                entity_id INTEGER NOT NULL REFERENCES entities(id),
+                PRIMARY KEY (search_id, entity_id)
+            );
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                {fts_columns}, content='entities', content_rowid='id'
+            );
+
+            CREATE TRIGGER IF NOT EXISTS entities_ai AFTER INSERT ON entities BEGIN
+                INSERT INTO entities_fts (rowid, {fts_columns}) VALUES (new.id, {new_values});
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS entities_ad AFTER DELETE ON entities BEGIN
+                INSERT INTO entities_fts (entities_fts, rowid, {fts_columns})
+                VALUES ('delete', old.id, {old_values});
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS entities_au AFTER UPDATE ON entities BEGIN
+                INSERT INTO entities_fts (entities_fts, rowid, {fts_columns})
+                VALUES ('delete', old.id, {old_values});
+                INSERT INTO entities_fts (rowid, {fts_columns}) VALUES (new.id, {new_values});
+            END;
+            """)
+
+    def save_search(self, entity_name: str, source: str, results: List[EntityResult],
+                    searched_at: Optional[float] = None) -> int:
+        """
+        Registra el scraping de una fuente y hace upsert de sus resultados.
+
+        Args:
+            entity_name: Nombre de la entidad buscada
+            source: Identificador de la fuente (offshore_leaks, world_bank, ofac)
+            results: Resultados devueltos por la fuente
+            searched_at: Momento del scraping (epoch); por defecto, ahora
+
+        Returns:
+            int: Identificador de la búsqueda registrada
+        """
+        searched_at = searched_at if searched_at is not None else time.time()
+        columns = ", ".join(ENTITY_FIELDS)
+        placeholders = ", ".join("?" for _ in ENTITY_FIELDS)
+        updates = ", ".join(f"{field} = excluded.{field}" for field in ENTITY_FIELDS)
+
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO searches (query_key, entity_name, source, searched_at, total_hits) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(entity_name), entity_name, source, searched_at, len(results))
+            )
+            search_id = cursor.lastrowid
+
+            for result in results:
+                values = [getattr(result, field) for field in ENTITY_FIELDS]
+                entity_id = self._conn.execute(
+                    f"INSERT INTO entities (result_key, {columns}, first_seen, last_seen) "
+                    f"VALUES (?, {placeholders}, ?, ?) "
+                    f"ON CONFLICT(result_key) DO UPDATE SET {updates}, last_seen = excluded.last_seen "
+                    f"RETURNING id",
+                    [result_key(result)] + values + [searched_at, searched_at]
+                ).fetchone()[0]
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO search_hits (search_id, entity_id) VALUES (?, ?)",
+                    (search_id, entity_id)
+                )
+
+        return search_id
+
+    def save_failure(self, entity_name: str, source: str, failed_at: Optional[float] = None):
+        """
+        Registra que el scraping de una fuente falló.
+
+        Un fallo no se guarda como búsqueda: no tiene resultados que reutilizar
+        y no debe confundirse con una búsqueda sin coincidencias.
+
+        Args:
+            entity_name: Nombre de la entidad buscada
+            source: Identificador de la fuente
+            failed_at: Momento del fallo (epoch); por defecto, ahora
+        """
+        failed_at = failed_at if failed_at is not None else time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO search_failures (query_key, source, failed_at) VALUES (?, ?, ?)",
+                (normalize_query(entity_name), source, failed_at)
+            )
+
+    def failed_since(self, entity_name: str, source: str, since: float) -> bool:
+        """
+        Indica si el scraping de una fuente falló después del momento indicado.
+
+        Args:
+            entity_name: Nombre de la entidad buscada
+            source: Identificador de la fuente
+            since: Momento mínimo (epoch)
+
+        Returns:
+            bool: True si hay algún fallo registrado desde since
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM search_failures WHERE query_key = ? AND source = ? AND failed_at >= ? LIMIT 1",
+                (normalize_query(entity_name), source, since)
+            ).fetchone()
+        return row is not None
+
+    def save_pending(self, entity_name: str, source_ids: List[str], issued_at: float) -> str:
+        """
+        Registra una búsqueda con fuentes pendientes y devuelve su referencia.
+
+        La referencia es aleatoria y no deriva del nombre, así que puede ir en
+        una URL sin exponerlo. Se eliminan de paso las pendientes caducadas.
+
+        Args:
+            entity_name: Nombre de la entidad buscada
+            source_ids: Fuentes que quedaron pendientes
+            issued_at: Momento de inicio de la búsqueda (epoch)
+
+        Returns:
+            str: Referencia de la búsqueda pendiente
+        """
+        reference = secrets.token_urlsafe(16)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM pending_searches WHERE issued_at < ?",
+                (time.time() - PENDING_SEARCH_TTL,)
+            )
+            self._conn.execute(
+                "INSERT INTO pending_searches (id, entity_name, sources, issued_at) VALUES (?, ?, ?, ?)",
+                (reference, entity_name, json.dumps(source_ids), issued_at)
+            )
+        return reference
+
+    def get_pending(self, reference: str) -> Optional[Dict[str, Any]]:
+        """
+        Devuelve una búsqueda pendiente registrada con save_pending().
+
+        Args:
+            reference: Referencia devuelta por save_pending()
+
+        Returns:
+            Optional[Dict[str, Any]]: Campos entity_name, sources e issued_at, o
+                None si no existe o ha caducado
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entity_name, sources, issued_at FROM pending_searches WHERE id = ? AND issued_at >= ?",
+                (reference, time.time() - PENDING_SEARCH_TTL)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "entity_name": row["entity_name"],
+            "sources": json.loads(row["sources"]),
+            "issued_at": row["issued_at"],
+        }
+
+    def get_fresh(self, entity_name: str, source: str, max_age: float) -> Optional[List[EntityResult]]:
+        """
+        Devuelve los resultados del último scraping si no supera la antigüedad indicada.
+
+        Args:
+            entity_name: Nombre de la entidad buscada
+            source: Identificador de la fuente
+            max_age: Antigüedad máxima aceptada en segundos
+
+        Returns:
+            Optional[List[EntityResult]]: Resultados guardados, o None si no hay datos frescos
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM searches WHERE query_key = ? AND source = ? AND searched_at >= ? "
+                "ORDER BY searched_at DESC LIMIT 1",
+                (normalize_query(entity_name), source, time.time() - max_age)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._search_results(row["id"])
+
+    def history(self, entity_name: Optional[str] = None, source: Optional[str] = None,
+                since: Optional[float] = None, until: Optional[float] = None,
+                limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Consulta el histórico de búsquedas para auditoría.
+
+        Args:
+            entity_name: Filtra por nombre buscado (normalizado)
+            source: Filtra por identificador de fuente
+            since: Fecha mínima (epoch)
+            until: Fecha máxima (epoch)
+            limit: Número máximo de búsquedas devueltas
+
+        Returns:
+            List[Dict[str, Any]]: Búsquedas con sus resultados, de la más reciente a la más antigua
+        """
+        conditions = []
+        params: List[Any] = []
+        if entity_name:
+            conditions.append("query_key = ?")
+            params.append(normalize_query(entity_name))
+        if source:
+            conditions.append("source = ?")
+            params.append(source)
+        if since is not None:
+            conditions.append("searched_at >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("searched_at <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM searches {where} ORDER BY searched_at DESC LIMIT ?",
+                params
+            ).fetchall()
+            return [
+                {
+                    "entity_name": row["entity_name"],
+                    "source": row["source"],
+                    "searched_at": row["searched_at"],
+                    "total_hits": row["total_hits"],
+                    "results": self._search_results(row["id"]),
+                }
+                for row in rows
+            ]
+
+    def search_text(self, text: str, source_names: Optional[List[str]] = None,
+                    limit: int = 50) -> List[EntityResult]:
+        """
+        Búsqueda de texto completo sobre todas las entidades guardadas.
+
+        Args:
+            text: Texto libre a buscar (nombre, dirección, país, programas...)
+            source_names: Filtra por nombre de fuente (p. ej. ["OFAC Sanctions"]);
+                las entidades guardan el nombre, no el identificador
+            limit: Número máximo de resultados
+
+        Returns:
+            List[EntityResult]: Entidades ordenadas por relevancia
+        """
+        query = _fts_query(text)
+        if not query:
+            return []
+
+        sql = (
+            "SELECT entities.* FROM entities_fts "
+            "JOIN entities ON entities.id = entities_fts.rowid "
+            "WHERE entities_fts MATCH ?"
+        )
+        params: List[Any] = [query]
+        if source_names:
+            sql += f" AND entities.source IN ({', '.join('?' * len(source_names))})"
+            params.extend(source_names)
+        sql += " ORDER BY entities_fts.rank LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._row_to_result(row) for row in rows]
+
+    def _search_results(self, search_id: int) -> List[EntityResult]:
+        """
+        Obtiene las entidades asociadas a una búsqueda (requiere tener el lock).
+        """
+        rows = self._conn.execute(
+            "SELECT entities.* FROM search_hits "
+            "JOIN entities ON entities.id = search_hits.entity_id "
+            "WHERE search_hits.search_id = ? ORDER BY entities.id",
+            (search_id,)
+        ).fetchall()
+        return [self._row_to_result(row) for row in rows]
+
+    @staticmethod
+    def _row_to_result(row: sqlite3.Row) -> EntityResult:
+        return EntityResult(**{field: row[field] for field in ENTITY_FIELDS})
+
+    def close(self):
+        """
+        Cierra la conexión con la base de datos.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+_store: Optional[ResultStore] = None
+_store_lock = threading.Lock()
+
+
+def get_result_store() -> ResultStore:
+    """
+    Obtiene la instancia compartida del almacén de resultados.
+
+    La ruta se toma de la configuración (RESULT_STORE_PATH).
+
+    Returns:
+        ResultStore: Almacén de resultados de la aplicación
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(get_settings().result_store_path)
+    return _store
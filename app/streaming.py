@@ -0,0 +1,283 @@
+"""
+Parseo incremental de páginas de resultados.
+
+En lugar de descargar la página completa y construir el árbol de
+BeautifulSoup, la respuesta se lee por bloques (stream=True) y un parser
+tipo SAX (html.parser.HTMLParser) extrae sólo las filas de resultados: cada
+fila se entrega en cuanto se cierra su etiqueta y después se descarta, así que
+la memoria usada no depende del tamaño de la página.
+"""
+
+import codecs
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# Bloques leídos de la respuesta en modo streaming
+CHUNK_SIZE = 64 * 1024
+
+# Bytes iniciales en los que se busca el BOM o el <meta charset> (como BeautifulSoup)
+SNIFF_SIZE = 2048
+
+# Elementos HTML sin etiqueta de cierre
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+
+@dataclass(frozen=True)
+class RowSpec:
+    """
+    Describe las filas de resultados de una página.
+
+    Attributes:
+        tag: Etiqueta de cada fila (p. ej. "tr")
+        css_class: Clase CSS que identifica las filas de resultados
+        fields: (etiqueta, clase) de cada campo de la fila; se usa el primer
+            elemento que coincida, como find() de BeautifulSoup
+        cells: Etiqueta de las celdas posicionales (p. ej. "td"); si se indica,
+            la fila contiene el texto de todas las celdas en orden
+    """
+    tag: str
+    css_class: str
+    fields: Tuple[Tuple[str, str], ...] = ()
+    cells: Optional[str] = None
+
+
+def _has_class(attrs: List[tuple], css_class: str) -> bool:
+    for name, value in attrs:
+        if name == "class" and value and css_class in value.split():
+            return True
+    return False
+
+
+class RowParser(HTMLParser):
+    """
+    Parser incremental que extrae las filas descritas por un RowSpec.
+
+    Se alimenta con feed(); las filas completas se acumulan en self.rows como
+    tuplas de textos (None si falta el campo) hasta que se consumen. El texto
+    de cada campo equivale a get_text(strip=True) de BeautifulSoup.
+
+    Las etiquetas de cierre se tratan como el árbol de BeautifulSoup
+    (html.parser): cierran el elemento abierto más reciente con ese nombre y
+    todos los que quedaron abiertos dentro de él (p. ej. <td> o <p> sin cierre);
+    las que no corresponden a ningún elemento abierto se ignoran.
+    """
+
+    def __init__(self, spec: RowSpec):
+        super().__init__(convert_charrefs=True)
+        self.spec = spec
+        self.rows: List[tuple] = []
+        # Elementos abiertos en el documento (sólo el nombre)
+        self._stack: List[str] = []
+        # Posición de la fila actual en la pila (None = fuera de una fila)
+        self._row_at: Optional[int] = None
+        self._values: list = []
+        # Campos que se están capturando: [índice, posición en la pila, textos]
+        self._captures: List[list] = []
+        # True si el último evento fue texto: HTMLParser puede partir un mismo
+        # nodo de texto entre varios bloques, y hay que unirlo antes de strip()
+        self._in_text = False
+
+    def handle_starttag(self, tag, attrs):
+        self._in_text = False
+        void = tag in VOID_ELEMENTS
+        if self._row_at is None:
+            if not void:
+                if tag == self.spec.tag and _has_class(attrs, self.spec.css_class):
+                    self._row_at = len(self._stack)
+                    self._values = [] if self.spec.cells else [None] * len(self.spec.fields)
+                self._stack.append(tag)
+            return
+
+        index = self._match(tag, attrs)
+        if void:
+            if index is not None:
+                self._values[index] = ""
+            return
+        if index is not None:
+            self._captures.append([index, len(self._stack), []])
+        self._stack.append(tag)
+
+    def _match(self, tag, attrs) -> Optional[int]:
+        if self.spec.cells:
+            if tag != self.spec.cells:
+                return None
+            self._values.append(None)
+            return len(self._values) - 1
+
+        capturing = {capture[0] for capture in self._captures}
+        for index, (field_tag, field_class) in enumerate(self.spec.fields):
+            if (self._values[index] is None and index not in capturing
+                    and tag == field_tag and _has_class(attrs, field_class)):
+                return index
+        return None
+
+    def handle_data(self, data):
+        for capture in self._captures:
+            if self._in_text and capture[2]:
+                capture[2][-1] += data
+            else:
+                capture[2].append(data)
+        self._in_text = True
+
+    def handle_comment(self, data):
+        self._in_text = False
+
+    def handle_endtag(self, tag):
+        self._in_text = False
+        if tag in VOID_ELEMENTS:
+            return
+        for position in range(len(self._stack) - 1, -1, -1):
+            if self._stack[position] == tag:
+                self._close_to(position)
+                return
+
+    def _close_to(self, position: int):
+        """
+        Cierra el elemento de la posición indicada y todos los abiertos dentro de él.
+        """
+        del self._stack[position:]
+        while self._captures and self._captures[-1][1] >= position:
+            index, _, parts = self._captures.pop()
+            self._values[index] = "".join(part.strip() for part in parts if part.strip())
+        if self._row_at is not None and self._row_at >= position:
+            self.rows.append(tuple(self._values))
+            self._row_at = None
+            self._values = []
+
+    def close(self):
+        super().close()
+        # Al final del documento se cierran los elementos que sigan abiertos
+        self._close_to(0)
+
+
+def iter_rows(spec: RowSpec, chunks: Iterable[str]) -> Iterator[tuple]:
+    """
+    Parsea los bloques de HTML según llegan y devuelve cada fila al cerrarse.
+
+    Args:
+        spec: Descripción de las filas de resultados
+        chunks: Bloques de texto de la página
+
+    Yields:
+        tuple: Textos de los campos (o de las celdas) de cada fila
+    """
+    parser = RowParser(spec)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.rows:
+            rows, parser.rows = parser.rows, []
+            yield from rows
+    parser.close()
+    yield from parser.rows
+
+
+def declared_encoding(response) -> Optional[str]:
+    """
+    Codificación declarada en la cabecera Content-Type de la respuesta.
+
+    requests usa ISO-8859-1 por defecto para text/* sin charset; aquí sólo se
+    devuelve la codificación si el servidor la indica, para que en otro caso
+    BeautifulSoup la detecte (<meta charset>, BOM, UTF-8).
+
+    Returns:
+        Optional[str]: Codificación, o None si la cabecera no la indica
+    """
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        return None
+    return response.encoding
+
+
+def sniff_encoding(head: bytes) -> Tuple[bytes, Optional[str]]:
+    """
+    Detecta la codificación de una página a partir de sus primeros bytes.
+
+    Sigue las mismas reglas que BeautifulSoup con bytes sin codificación
+    declarada: primero el BOM y después <meta charset> o <meta http-equiv>
+    en los primeros SNIFF_SIZE bytes.
+
+    Args:
+        head: Primeros bytes de la página
+
+    Returns:
+        Tuple[bytes, Optional[str]]: Bytes sin el BOM y codificación detectada,
+            o None si la página no la indica
+    """
+    # BeautifulSoup se importa en el primer uso
+    from bs4.dammit import EncodingDetector
+
+    head, encoding = EncodingDetector.strip_byte_order_mark(head)
+    if encoding is None:
+        encoding = EncodingDetector.find_declared_encoding(head[:SNIFF_SIZE], is_html=True)
+    return head, encoding
+
+
+def decode_chunks(chunks: Iterable[bytes], encoding: Optional[str] = None) -> Iterator[str]:
+    """
+    Decodifica por bloques el contenido de una página.
+
+    Si el servidor no declara la codificación, se detecta en los primeros
+    bytes (sniff_encoding) y, si la página tampoco la indica, se usa UTF-8.
+    A diferencia de BeautifulSoup, no se intenta adivinar la codificación de
+    páginas sin declarar (no se puede volver atrás sobre bloques ya parseados).
+
+    Args:
+        chunks: Bloques de bytes de la página
+        encoding: Codificación declarada en la cabecera Content-Type
+
+    Yields:
+        str: Bloques decodificados
+    """
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_SIZE:
+            break
+
+    head, sniffed = sniff_encoding(head)
+    decoder = None
+    for candidate in (encoding, sniffed, "utf-8"):
+        try:
+            decoder = codecs.getincrementaldecoder(candidate)(errors="replace")
+            break
+        except (LookupError, TypeError):
+            continue
+
+    for chunk in chain([head], chunks):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def stream_text(session, url: str, params: dict, timeout: float = 30,
+                chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Descarga una página por bloques de texto sin cargarla entera en memoria.
+
+    La codificación se elige como en el parseo completo: la de la cabecera
+    Content-Type o, si no la hay, la del BOM o el <meta charset> de la página.
+
+    Args:
+        session: Sesión HTTP (requests.Session)
+        url: URL a consultar
+        params: Parámetros de la query string
+        timeout: Timeout de conexión y de lectura de cada bloque
+        chunk_size: Tamaño de los bloques en bytes
+
+    Yields:
+        str: Bloques de la página decodificados
+
+    Raises:
+        requests.HTTPError: Si la respuesta no es 2xx
+    """
+    with session.get(url, params=params, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        yield from decode_chunks(response.iter_content(chunk_size=chunk_size), declared_encoding(response))
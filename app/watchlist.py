@@ -0,0 +1,478 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import get_settings
+from .logging_config import bind_request_id, new_request_id, reset_request_id
+from .models import EntityResult
+from .storage import normalize_query, result_key
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint(results: List[EntityResult]) -> str:
+    """
+    Huella del conjunto de resultados de un nombre.
+
+    No depende del orden de los resultados: dos screenings con las mismas
+    coincidencias producen la misma huella.
+
+    Args:
+        results: Resultados del screening
+
+    Returns:
+        str: Hash SHA-256 en hexadecimal
+    """
+    digest = hashlib.sha256()
+    for key in sorted(result_key(result) for result in results):
+        digest.update(key.encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+class WatchlistStore:
+    """
+    Lista de nombres vigilados y cambios detectados, en SQLite.
+
+    Usa la misma base de datos que el almacén de resultados. Cada nombre guarda
+    la huella y las coincidencias de su último screening; sólo cuando la huella
+    cambia se calcula el diff y se registra un cambio.
+    """
+
+    def __init__(self, db_path: str):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS watchlist (
+                id INTEGER PRIMARY KEY,
+                query_key TEXT NOT NULL,
+                entity_name TEXT NOT NULL,
+                sources TEXT NOT NULL,
+                callback_url TEXT,
+                created_at REAL NOT NULL,
+                last_checked REAL,
+                claimed_until REAL,
+                fingerprint TEXT,
+                hits TEXT,
+                retries INTEGER NOT NULL DEFAULT 0,
+                retry_sources TEXT,
+                partial_hits TEXT,
+                UNIQUE (query_key, sources)
+            );
+
+            CREATE TABLE IF NOT EXISTS watchlist_changes (
+                id INTEGER PRIMARY KEY,
+                watch_id INTEGER NOT NULL,
+                entity_name TEXT NOT NULL,
+                detected_at REAL NOT NULL,
+                added TEXT NOT NULL,
+                removed TEXT NOT NULL
+            );
+
+            CREATE INDEX IF NOT EXISTS idx_watchlist_due ON watchlist (last_checked);
+            CREATE INDEX IF NOT EXISTS idx_watchlist_changes_time ON watchlist_changes (detected_at);
+            """)
+            # Columnas añadidas después de crear la tabla en bases existentes
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(watchlist)")}
+            for column, definition in (("retries", "INTEGER NOT NULL DEFAULT 0"),
+                                       ("retry_sources", "TEXT"), ("partial_hits", "TEXT")):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE watchlist ADD COLUMN {column} {definition}")
+
+    def add(self, entity_name: str, sources: List[str], callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Añade un nombre a la lista (o actualiza su callback si ya existía).
+
+        Args:
+            entity_name: Nombre a vigilar
+            sources: Identificadores de las fuentes a consultar
+            callback_url: URL a la que enviar los cambios detectados
+
+        Returns:
+            Dict[str, Any]: Entrada de la lista
+        """
+        sources_value = ",".join(sources)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO watchlist (query_key, entity_name, sources, callback_url, created_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(query_key, sources) DO UPDATE SET callback_url = excluded.callback_url",
+                (normalize_query(entity_name), entity_name, sources_value, callback_url, time.time())
+            )
+            row = self._conn.execute(
+                "SELECT * FROM watchlist WHERE query_key = ? AND sources = ?",
+                (normalize_query(entity_name), sources_value)
+            ).fetchone()
+        return self._entry(row)
+
+    def remove(self, watch_id: int) -> bool:
+        """
+        Elimina un nombre de la lista. Devuelve False si no existía.
+        """
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM watchlist WHERE id = ?", (watch_id,)).rowcount
+        return deleted > 0
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Devuelve todos los nombres vigilados.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM watchlist ORDER BY id").fetchall()
+        return [self._entry(row) for row in rows]
+
+    def claim_due(self, interval: float, limit: int, lease: float = 600) -> List[Dict[str, Any]]:
+        """
+        Reserva los nombres cuyo último screening es más antiguo que interval.
+
+        La reserva (claimed_until) evita que varios workers re-screeneen el
+        mismo nombre a la vez.
+
+        Args:
+            interval: Segundos entre screenings de un mismo nombre
+            limit: Número máximo de nombres a reservar
+            lease: Segundos que dura la reserva
+
+        Returns:
+            List[Dict[str, Any]]: Entradas reservadas
+        """
+        now = time.time()
+        claimed = []
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT * FROM watchlist "
+                "WHERE (last_checked IS NULL OR last_checked <= ?) "
+                "AND (claimed_until IS NULL OR claimed_until < ?) "
+                "ORDER BY last_checked IS NOT NULL, last_checked LIMIT ?",
+                (now - interval, now, limit)
+            ).fetchall()
+            for row in rows:
+                updated = self._conn.execute(
+                    "UPDATE watchlist SET claimed_until = ? "
+                    "WHERE id = ? AND (claimed_until IS NULL OR claimed_until < ?)",
+                    (now + lease, row["id"], now)
+                ).rowcount
+                if updated:
+                    claimed.append(self._entry(row, with_hits=True))
+        return claimed
+
+    def record_screening(self, entry: Dict[str, Any], results: List[EntityResult]) -> Optional[Dict[str, Any]]:
+        """
+        Guarda el resultado de un screening y calcula el diff si algo cambió.
+
+        Si la huella coincide con la anterior sólo se actualiza last_checked.
+        El primer screening de un nombre fija la línea base sin generar cambio.
+        En ambos casos se descarta el estado de reintento (postpone).
+
+        Args:
+            entry: Entrada reservada con claim_due()
+            results: Resultados del nuevo screening
+
+        Returns:
+            Optional[Dict[str, Any]]: Cambio registrado (added/removed), o None si no hubo cambios
+        """
+        now = time.time()
+        new_fingerprint = fingerprint(results)
+
+        if new_fingerprint == entry["fingerprint"]:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE watchlist SET last_checked = ?, claimed_until = NULL, "
+                    "retries = 0, retry_sources = NULL, partial_hits = NULL WHERE id = ?",
+                    (now, entry["id"])
+                )
+            return None
+
+        new_hits = {result_key(result): result.model_dump() for result in results}
+        change = None
+        if entry["fingerprint"] is not None:
+            old_hits = entry["hits"]
+            change = {
+                "watch_id": entry["id"],
+                "entity_name": entry["entity_name"],
+                "detected_at": now,
+                "added": [new_hits[key] for key in new_hits if key not in old_hits],
+                "removed": [old_hits[key] for key in old_hits if key not in new_hits],
+            }
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE watchlist SET last_checked = ?, claimed_until = NULL, fingerprint = ?, hits = ?, "
+                "retries = 0, retry_sources = NULL, partial_hits = NULL WHERE id = ?",
+                (now, new_fingerprint, json.dumps(new_hits), entry["id"])
+            )
+            if change is not None:
+                change["id"] = self._conn.execute(
+                    "INSERT INTO watchlist_changes (watch_id, entity_name, detected_at, added, removed) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (entry["id"], entry["entity_name"], now,
+                     json.dumps(change["added"]), json.dumps(change["removed"]))
+                ).lastrowid
+        return change
+
+    def postpone(self, entry: Dict[str, Any], retry_sources: List[str],
+                 partial: List[EntityResult], delay: float):
+        """
+        Aplaza un screening incompleto (fuentes caídas) sin tocar la referencia.
+
+        La reserva se mantiene hasta dentro de delay segundos, así que el
+        nombre no se vuelve a reclamar antes. El reintento sólo consulta
+        retry_sources y completa el screening con los resultados guardados
+        de las demás fuentes.
+
+        Args:
+            entry: Entrada reservada con claim_due()
+            retry_sources: Fuentes que quedan por consultar
+            partial: Resultados ya obtenidos de las demás fuentes
+            delay: Segundos hasta el reintento
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE watchlist SET claimed_until = ?, retries = retries + 1, "
+                "retry_sources = ?, partial_hits = ? WHERE id = ?",
+                (time.time() + delay, ",".join(retry_sources),
+                 json.dumps([result.model_dump() for result in partial]), entry["id"])
+            )
+
+    def release(self, watch_id: int):
+        """
+        Libera la reserva de un nombre sin registrar screening (p. ej. tras un error).
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE watchlist SET claimed_until = NULL WHERE id = ?", (watch_id,))
+
+    def changes(self, since: Optional[float] = None, entity_name: Optional[str] = None,
+                limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Devuelve los cambios detectados, del más reciente al más antiguo.
+
+        Args:
+            since: Fecha mínima (epoch)
+            entity_name: Filtra por nombre vigilado
+            limit: Número máximo de cambios
+        """
+        conditions = []
+        params: List[Any] = []
+        if since is not None:
+            conditions.append("detected_at >= ?")
+            params.append(since)
+        if entity_name:
+            conditions.append("watch_id IN (SELECT id FROM watchlist WHERE query_key = ?)")
+            params.append(normalize_query(entity_name))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT * FROM watchlist_changes {where} ORDER BY detected_at DESC LIMIT ?",
+                params
+            ).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "watch_id": row["watch_id"],
+                "entity_name": row["entity_name"],
+                "detected_at": row["detected_at"],
+                "added": json.loads(row["added"]),
+                "removed": json.loads(row["removed"]),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def _entry(row: sqlite3.Row, with_hits: bool = False) -> Dict[str, Any]:
+        hits = json.loads(row["hits"]) if row["hits"] else {}
+        entry = {
+            "id": row["id"],
+            "entity_name": row["entity_name"],
+            "sources": row["sources"].split(","),
+            "callback_url": row["callback_url"],
+            "created_at": row["created_at"],
+            "last_checked": row["last_checked"],
+            "fingerprint": row["fingerprint"],
+            "total_hits": len(hits),
+        }
+        if with_hits:
+            entry["hits"] = hits
+            entry["retries"] = row["retries"]
+            entry["retry_sources"] = row["retry_sources"].split(",") if row["retry_sources"] else None
+            entry["partial"] = [EntityResult(**hit) for hit in json.loads(row["partial_hits"] or "[]")]
+        return entry
+
+
+class WatchlistScheduler:
+    """
+    Hilo en segundo plano que re-screenea periódicamente los nombres vigilados.
+
+    Cada poll_interval segundos reserva los nombres cuyo último screening tiene
+    más de interval segundos, los busca de nuevo y registra sólo los cambios.
+    """
+
+    def __init__(self, store: WatchlistStore, result_store, interval: float,
+                 poll_interval: float = 60, batch_size: int = 50, retry_delay: float = 300):
+        self.store = store
+        self.result_store = result_store
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="watchlist", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Error en el ciclo de la watchlist")
+            self._stop.wait(self.poll_interval)
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """
+        Re-screenea los nombres pendientes.
+
+        Returns:
+            List[Dict[str, Any]]: Cambios detectados en este ciclo
+        """
+        detected = []
+        for entry in self.store.claim_due(self.interval, self.batch_size):
+            if self._stop.is_set():
+                self.store.release(entry["id"])
+                continue
+            # Cada re-screening se registra en los logs con su propio id
+            token = bind_request_id(new_request_id())
+            try:
+                change = self._screen(entry)
+            finally:
+                reset_request_id(token)
+            if change is not None:
+                detected.append(change)
+        return detected
+
+    def retry_after(self, retries: int) -> float:
+        """
+        Segundos hasta el siguiente intento tras `retries` fallos seguidos.
+        """
+        return min(self.interval, self.retry_delay * 2 ** (retries - 1))
+
+    def _screen(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        from .scraping import search_entity
+        from .sources import get_source
+
+        # Tras un fallo sólo se consultan las fuentes que fallaron
+        sources = entry["retry_sources"] or entry["sources"]
+        try:
+            response = search_entity(entry["entity_name"], sources, store=self.result_store)
+            results = entry["partial"] + response.results
+            if response.failed_sources:
+                # Una fuente caída parecería un conjunto vacío y todas sus
+                # coincidencias se notificarían como eliminadas: se deja la
+                # referencia como está y se reintenta más tarde
+                failed = [source_id for source_id in sources
+                          if get_source(source_id).name in response.failed_sources]
+                delay = self.retry_after(entry["retries"] + 1)
+                logger.warning("Re-screening del nombre vigilado %s aplazado %.0fs: fallaron %s",
+                               entry["id"], delay, ", ".join(response.failed_sources),
+                               extra={"watch_id": entry["id"]})
+                self.store.postpone(entry, failed, results, delay)
+                return None
+            change = self.store.record_screening(entry, results)
+        except Exception:
+            logger.exception("Error re-screeneando el nombre vigilado %s", entry["id"],
+                             extra={"watch_id": entry["id"]})
+            self.store.postpone(entry, sources, entry["partial"], self.retry_after(entry["retries"] + 1))
+            return None
+
+        if change is not None:
+            logger.info("Cambio en el nombre vigilado %s: %d nuevas, %d eliminadas",
+                        entry["id"], len(change["added"]), len(change["removed"]),
+                        extra={"watch_id": entry["id"], "change_id": change["id"]})
+            if entry["callback_url"]:
+                notify_change(entry["callback_url"], change)
+        return change
+
+
+def notify_change(callback_url: str, change: Dict[str, Any]):
+    """
+    Envía un cambio detectado a la URL de callback del nombre vigilado.
+    """
+    from .models import WatchlistChange
+    from .webhooks import WebhookSecretMissing, get_dispatcher
+
+    try:
+        dispatcher = get_dispatcher()
+    except WebhookSecretMissing as e:
+        logger.error("No se notificó el cambio %s: %s", change["id"], e, extra={"change_id": change["id"]})
+        return
+    if not dispatcher.try_reserve():
+        logger.error("Cola de callbacks llena: no se notificó el cambio %s", change["id"],
+                     extra={"change_id": change["id"]})
+        return
+    dispatcher.submit_job(f"watchlist-{change['id']}", callback_url,
+                          lambda: WatchlistChange.from_record(change))
+
+
+_store: Optional[WatchlistStore] = None
+_scheduler: Optional[WatchlistScheduler] = None
+_lock = threading.Lock()
+
+
+def get_watchlist_store() -> WatchlistStore:
+    """
+    Obtiene la lista de vigilancia compartida (en RESULT_STORE_PATH).
+    """
+    global _store
+    if _store is None:
+        with _lock:
+            if _store is None:
+                _store = WatchlistStore(get_settings().result_store_path)
+    return _store
+
+
+def start_scheduler():
+    """
+    Arranca el scheduler de la watchlist si está habilitado (WATCHLIST_ENABLED).
+    """
+    global _scheduler
+    settings = get_settings()
+    if not settings.watchlist_enabled or _scheduler is not None:
+        return
+
+    from .storage import get_result_store
+
+    _scheduler = WatchlistScheduler(
+        get_watchlist_store(),
+        get_result_store(),
+        interval=settings.watchlist_interval,
+        poll_interval=settings.watchlist_poll_interval,
+        batch_size=settings.watchlist_batch_size,
+        retry_delay=settings.watchlist_retry_delay,
+    )
+    _scheduler.start()
+
+
+def stop_scheduler():
+    """
+    Detiene el scheduler si está en marcha.
+    """
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
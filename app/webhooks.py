@@ -0,0 +1,353 @@
+import hashlib
+import heapq
+import hmac
+import ipaddress
+import itertools
+import json
+import logging
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from .config import get_settings
+from .logging_config import SAMPLED, describe_error, propagate_request_id
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookSecretMissing(RuntimeError):
+    """
+    No se pueden enviar callbacks: WEBHOOK_SECRET no está definido.
+    """
+
+
+def sign_payload(body: bytes, timestamp: str, secret: str) -> str:
+    """
+    Firma HMAC-SHA256 de una entrega: se firma "<timestamp>.<cuerpo>".
+
+    El receptor debe recalcularla con el mismo secreto y comparar con la
+    cabecera X-Webhook-Signature (formato "sha256=<hex>").
+
+    Args:
+        body: Cuerpo JSON enviado
+        timestamp: Valor de la cabecera X-Webhook-Timestamp
+        secret: Secreto compartido (WEBHOOK_SECRET)
+
+    Returns:
+        str: Firma en formato "sha256=<hex>"
+    """
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_callback_url(url: str, resolve: bool = True) -> str:
+    """
+    Comprueba que una URL de callback apunta a un destino público.
+
+    Evita que la API se use para enviar peticiones a la red interna (SSRF):
+    se rechazan las direcciones privadas, de loopback, link-local (p. ej.
+    169.254.169.254, metadatos del proveedor cloud), reservadas y multicast.
+    Los hosts de WEBHOOK_ALLOWED_HOSTS se aceptan sin comprobar su dirección;
+    si la lista no está vacía, sólo se aceptan esos hosts.
+
+    Args:
+        url: URL de callback
+        resolve: Si es False no se consulta el DNS; sólo se comprueban el
+            esquema, el host y las direcciones IP escritas en la URL
+
+    Returns:
+        str: La misma URL
+
+    Raises:
+        ValueError: Si la URL no es válida o su destino no está permitido
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url debe ser una URL http:// o https://")
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        raise ValueError("callback_url tiene un puerto inválido")
+
+    host = parts.hostname.rstrip(".").lower()
+    allowed_hosts = get_settings().webhook_allowed_hosts
+    if host in allowed_hosts:
+        return url
+    if allowed_hosts:
+        raise ValueError("El host de callback_url no está en WEBHOOK_ALLOWED_HOSTS")
+
+    try:
+        addresses = [str(ipaddress.ip_address(host))]
+    except ValueError:
+        if not resolve:
+            return url
+        try:
+            addresses = [info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+        except (socket.gaierror, UnicodeError):
+            raise ValueError("No se puede resolver el host de callback_url")
+
+    if not all(_is_public_address(address) for address in addresses):
+        raise ValueError("callback_url no puede apuntar a una dirección privada, local o reservada")
+    return url
+
+
+@dataclass
+class Delivery:
+    """
+    Entrega pendiente de un resultado a una URL de callback.
+    """
+    id: str
+    url: str
+    body: bytes
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+
+
+class WebhookDispatcher:
+    """
+    Cola acotada de entregas salientes con reintentos y backoff exponencial.
+
+    La capacidad se reserva al aceptar la búsqueda (try_reserve) y se libera
+    cuando la entrega termina, con éxito o tras agotar los reintentos; así la
+    API responde 503 en vez de acumular trabajo sin límite.
+    """
+
+    def __init__(self, secret: str, max_pending: int = 1000, workers: int = 2,
+                 job_workers: int = 4, max_attempts: int = 6, backoff_base: float = 1.0,
+                 backoff_max: float = 60.0, timeout: float = 10.0):
+        self.secret = secret
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._queue: List[tuple] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._stopping = False
+        # Límite de la última ronda de entregas al detener (epoch)
+        self._deadline: Optional[float] = None
+        self._session = requests.Session()
+        self._jobs = ThreadPoolExecutor(max_workers=job_workers, thread_name_prefix="callback-job")
+        self._running_jobs = set()
+        self._workers = [
+            threading.Thread(target=self._run, name=f"webhook-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def try_reserve(self) -> bool:
+        """
+        Reserva un hueco en la cola. Devuelve False si la cola está llena.
+        """
+        return self._slots.acquire(blocking=False)
+
+    def submit_job(self, job_id: str, url: str, job: Callable[[], object]):
+        """
+        Ejecuta job en segundo plano y entrega su resultado en url.
+
+        Requiere haber reservado un hueco con try_reserve().
+
+        Args:
+            job_id: Identificador de la entrega (cabecera X-Webhook-Id)
+            url: URL de callback
+            job: Función que devuelve el objeto a enviar (modelo Pydantic)
+        """
+        def run():
+            try:
+                result = job()
+                body = result.model_dump_json().encode("utf-8")
+            except Exception:
+                logger.exception("Error ejecutando la búsqueda para el callback %s", job_id,
+                                 extra={"delivery_id": job_id})
+                body = json.dumps({"id": job_id, "error": "Error interno al realizar la búsqueda"}).encode()
+            self._schedule(Delivery(id=job_id, url=url, body=body), time.time())
+
+        def release_if_cancelled(future):
+            # Búsquedas canceladas al detener: no habrá entrega
+            if future.cancelled():
+                logger.warning("Callback %s cancelado al detener el servicio", job_id,
+                               extra={"delivery_id": job_id})
+                self._slots.release()
+
+        future = self._jobs.submit(propagate_request_id(run))
+        self._running_jobs.add(future)
+        future.add_done_callback(self._running_jobs.discard)
+        future.add_done_callback(release_if_cancelled)
+
+    def _schedule(self, delivery: Delivery, due: float):
+        with self._condition:
+            heapq.heappush(self._queue, (due, next(self._sequence), delivery))
+            self._condition.notify()
+
+    def _next_delivery(self) -> Optional[Delivery]:
+        """
+        Espera a que haya una entrega lista para enviar (o a la parada).
+        """
+        with self._condition:
+            while True:
+                if self._stopping and not self._queue:
+                    return None
+                if self._stopping and time.time() >= self._deadline:
+                    self._drop_pending()
+                    return None
+                if self._queue:
+                    due = self._queue[0][0]
+                    wait = due - time.time()
+                    if wait <= 0 or self._stopping:
+                        return heapq.heappop(self._queue)[2]
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+    def _drop_pending(self):
+        """
+        Descarta las entregas que no caben en el tiempo de parada (con el lock tomado).
+        """
+        for _, _, delivery in self._queue:
+            logger.error("Callback %s descartado al detener el servicio", delivery.id,
+                         extra={"delivery_id": delivery.id, "attempt": delivery.attempts})
+            self._slots.release()
+        self._queue.clear()
+
+    def _run(self):
+        while True:
+            delivery = self._next_delivery()
+            if delivery is None:
+                return
+            self._deliver(delivery)
+
+    def _deliver(self, delivery: Delivery):
+        # Se vuelve a comprobar el destino: el DNS puede haber cambiado desde
+        # que se aceptó la URL
+        try:
+            check_callback_url(delivery.url)
+        except ValueError as e:
+            logger.error("Callback %s descartado: %s", delivery.id, e, extra={"delivery_id": delivery.id})
+            self._slots.release()
+            return
+
+        delivery.attempts += 1
+        timestamp = str(int(time.time()))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Id": delivery.id,
+            "X-Webhook-Timestamp": timestamp,
+            "X-Webhook-Attempt": str(delivery.attempts),
+            "X-Webhook-Signature": sign_payload(delivery.body, timestamp, self.secret),
+        }
+
+        # Al detener, ninguna entrega puede pasar del plazo de stop()
+        timeout = self.timeout
+        if self._deadline is not None:
+            timeout = max(0.1, min(timeout, self._deadline - time.time()))
+
+        retry = True
+        try:
+            # Sin seguir redirecciones: podrían llevar a un destino interno
+            response = self._session.post(delivery.url, data=delivery.body, headers=headers,
+                                          timeout=timeout, allow_redirects=False)
+            if 200 <= response.status_code < 300:
+                logger.info("Callback %s entregado", delivery.id, extra={
+                    **SAMPLED, "delivery_id": delivery.id, "attempt": delivery.attempts,
+                })
+                self._slots.release()
+                return
+            # Los errores 4xx (salvo 408 y 429) no se arreglan reintentando
+            retry = response.status_code >= 500 or response.status_code in (408, 429)
+            error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = describe_error(e)
+
+        if retry and delivery.attempts < self.max_attempts and not self._stopping:
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (delivery.attempts - 1))
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning("Callback %s falló (%s); reintento en %.1fs", delivery.id, error, delay,
+                           extra={"delivery_id": delivery.id, "attempt": delivery.attempts})
+            self._schedule(delivery, time.time() + delay)
+        else:
+            logger.error("Callback %s descartado tras %d intentos: %s", delivery.id, delivery.attempts, error,
+                         extra={"delivery_id": delivery.id, "attempt": delivery.attempts})
+            self._slots.release()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Detiene los workers en como mucho `timeout` segundos.
+
+        Las búsquedas que aún no han empezado se cancelan y liberan su hueco;
+        las que están en curso pueden terminar dentro del plazo. Después se
+        intenta una última vez cada entrega pendiente; las que no caben en el
+        plazo se descartan.
+        """
+        deadline = time.time() + timeout
+        self._jobs.shutdown(wait=False, cancel_futures=True)
+        wait(list(self._running_jobs), timeout=max(0, deadline - time.time()))
+        with self._condition:
+            self._deadline = deadline
+            self._stopping = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join(max(0, deadline - time.time()))
+
+
+_dispatcher: Optional[WebhookDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> WebhookDispatcher:
+    """
+    Obtiene el dispatcher de webhooks compartido, creándolo en el primer uso.
+
+    La configuración se toma de las variables WEBHOOK_*. Las entregas se
+    firman con WEBHOOK_SECRET, que es obligatorio: quien verifica los
+    callbacks no debe necesitar la credencial de la API.
+
+    Raises:
+        WebhookSecretMissing: Si WEBHOOK_SECRET no está definido
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                settings = get_settings()
+                if not settings.webhook_secret:
+                    raise WebhookSecretMissing("WEBHOOK_SECRET no está definido: no se pueden enviar callbacks")
+                _dispatcher = WebhookDispatcher(
+                    secret=settings.webhook_secret,
+                    max_pending=settings.webhook_queue_size,
+                    workers=settings.webhook_workers,
+                    max_attempts=settings.webhook_max_attempts,
+                    backoff_base=settings.webhook_backoff_base,
+                )
+    return _dispatcher
+
+
+def shutdown_dispatcher():
+    """
+    Detiene el dispatcher si se llegó a crear.
+    """
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria: parseo completo (BeautifulSoup) vs. parseo en streaming.
+
+Sirve en local una página de firmas del World Bank con muchas filas y, en un
+proceso nuevo por modo, lanza N búsquedas concurrentes contra ella con
+STREAMING_PARSE desactivado y activado. Cada proceso informa de su pico de RSS
+(ru_maxrss) por encima del RSS tras importar la aplicación.
+
+Uso:
+    python benchmarks/bench_memory.py [--rows 20000] [--concurrency 16]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ROW = (
+    '<tr class="debarred-firm"><td>Firm {i} S.A.</td><td>Calle {i}, 28001 Madrid</td>'
+    '<td>Spain</td><td>01-JAN-2020</td><td>31-DEC-2030</td><td>Fraudulent Practice</td></tr>\n'
+)
+
+# Código ejecutado en cada proceso hijo: busca en paralelo y mide el pico de RSS
+CHILD = """
+import json, resource, sys, time
+from concurrent.futures import ThreadPoolExecutor
+from app.scraping import WebScraper
+from app.sources import get_source, world_bank
+
+world_bank.SEARCH_URL = sys.argv[1]
+concurrency = int(sys.argv[2])
+plugin = get_source("world_bank")
+plugin.semaphore = __import__("threading").BoundedSemaphore(concurrency)
+
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+with ThreadPoolExecutor(concurrency) as pool:
+    counts = list(pool.map(lambda _: len(WebScraper().search_source(plugin, "firm")), range(concurrency)))
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"rows": counts, "seconds": elapsed, "baseline_kb": baseline, "peak_kb": peak}))
+"""
+
+
+def make_page(rows: int) -> bytes:
+    body = "".join(ROW.format(i=i) for i in range(rows))
+    return f"<html><body><table>\n{body}</table></body></html>".encode()
+
+
+def serve(page: bytes) -> ThreadingHTTPServer:
+    """
+    Sirve la página en un puerto libre de localhost, en un hilo aparte.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_mode(url: str, concurrency: int, streaming: bool) -> dict:
+    env = dict(os.environ, STREAMING_PARSE="true" if streaming else "false",
+               PYTHONPATH=ROOT, LOG_LEVEL="WARNING")
+    output = subprocess.run([sys.executable, "-c", CHILD, url, str(concurrency)],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    server = serve(page)
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"Python {sys.version.split()[0]} | página de {len(page) / 1e6:.1f} MB "
+          f"({args.rows} filas) | {args.concurrency} búsquedas concurrentes")
+    print()
+    print(f"{'modo':<12} {'pico RSS (MB)':>14} {'sobre base (MB)':>16} {'tiempo (s)':>11} {'filas':>8}")
+    for name, streaming in (("completo", False), ("streaming", True)):
+        result = run_mode(url, args.concurrency, streaming)
+        assert len(set(result["rows"])) == 1, result["rows"]
+        print(f"{name:<12} {result['peak_kb'] / 1024:>14.1f} "
+              f"{(result['peak_kb'] - result['baseline_kb']) / 1024:>16.1f} "
+              f"{result['seconds']:>11.2f} {result['rows'][0]:>8}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
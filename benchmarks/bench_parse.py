@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark de parseo: páginas por segundo según el executor y el número de workers.
+
+Simula muchas búsquedas concurrentes que ya han descargado su página: varios
+hilos "de scraping" entregan los bytes de la página al executor de parseo y
+reconstruyen los resultados a partir de las tuplas devueltas, igual que
+app.parsing.parse_content. Compara el parseo en los propios hilos (inline),
+un pool de hilos y un pool de procesos con 1..N workers.
+
+Uso:
+    python benchmarks/bench_parse.py [--pages 200] [--rows 200] [--max-workers 8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app.parsing import create_executor, parse_page, to_results  # noqa: E402
+from app.sources import get_source  # noqa: E402
+
+ROW = (
+    '<tr class="debarred-firm"><td>Firm {i} S.A.</td><td>Calle {i}, 28001 Madrid</td>'
+    '<td>Spain</td><td>01-JAN-2020</td><td>31-DEC-2030</td><td>Fraudulent Practice</td></tr>\n'
+)
+
+# Hilos que simulan las búsquedas concurrentes
+SCRAPER_THREADS = 16
+
+
+def make_page(rows: int) -> bytes:
+    body = "".join(ROW.format(i=i) for i in range(rows))
+    return f"<html><body><table>\n{body}</table></body></html>".encode()
+
+
+def run(mode: str, workers: int, page: bytes, pages: int) -> float:
+    """
+    Parsea `pages` copias de la página y devuelve páginas por segundo.
+    """
+    plugin = get_source("world_bank")
+    executor = create_executor(mode, workers)
+
+    if executor is None:
+        def parse_one(_):
+            return len(plugin.parse(page))
+    else:
+        def parse_one(_):
+            return len(to_results(executor.submit(parse_page, plugin.id, page).result()))
+        # Arrancar los workers antes de medir (en modo proceso importan la app)
+        list(executor.map(parse_page, [plugin.id] * workers, [page] * workers))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(SCRAPER_THREADS) as scrapers:
+        counts = list(scrapers.map(parse_one, range(pages)))
+    elapsed = time.perf_counter() - start
+
+    if executor is not None:
+        executor.shutdown()
+    assert len(set(counts)) == 1, counts
+    return pages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    page = make_page(args.rows)
+    worker_counts = sorted({1, *(2 ** i for i in range(1, 8) if 2 ** i <= args.max_workers), args.max_workers})
+
+    print(f"Python {sys.version.split()[0]} | {os.cpu_count()} CPU | {args.pages} páginas de "
+          f"{len(page) / 1024:.0f} KB ({args.rows} filas) | {SCRAPER_THREADS} hilos de scraping")
+    print()
+    print(f"{'executor':<10} {'workers':>8} {'páginas/s':>10}")
+    baseline = run("inline", 0, page, args.pages)
+    print(f"{'inline':<10} {'-':>8} {baseline:>10.1f}")
+    for mode in ("thread", "process"):
+        for workers in worker_counts:
+            rate = run(mode, workers, page, args.pages)
+            print(f"{mode:<10} {workers:>8} {rate:>10.1f}   x{rate / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput del servidor: modo desarrollo vs. modo producción.
+
+Arranca `run.py` en cada modo, lanza peticiones GET /health con conexiones
+keep-alive concurrentes durante unos segundos y muestra peticiones por segundo
+y latencias. El generador de carga usa sockets de asyncio para no depender de
+herramientas externas (wrk, ab...).
+
+Uso:
+    python benchmarks/bench_server.py [--duration 10] [--connections 64]
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _client(host: str, port: int, deadline: float, latencies: list):
+    """
+    Conexión keep-alive que repite GET /health hasta la fecha límite.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    request = f"GET /health HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+async def _load(host: str, port: int, duration: float, connections: int) -> list:
+    latencies: list = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*[_client(host, port, deadline, latencies) for _ in range(connections)])
+    return latencies
+
+
+def _wait_ready(url: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {url}")
+
+
+def run_mode(mode: str, port: int, duration: float, connections: int) -> dict:
+    """
+    Arranca el servidor en el modo indicado y mide su throughput.
+    """
+    process = subprocess.Popen(
+        [sys.executable, "run.py", "--mode", mode, "--host", "127.0.0.1", "--port", str(port)],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        _wait_ready(f"http://127.0.0.1:{port}/health")
+        # Calentamiento breve antes de medir
+        asyncio.run(_load("127.0.0.1", port, 1, connections))
+        latencies = asyncio.run(_load("127.0.0.1", port, duration, connections))
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()} | conexiones: {args.connections} | duración: {args.duration}s")
+    print(f"{'modo':<12} {'peticiones':>10} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode in ("development", "production"):
+        result = run_mode(mode, args.port, args.duration, args.connections)
+        print(f"{result['mode']:<12} {result['requests']:>10} {result['rps']:>10.0f} "
+              f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
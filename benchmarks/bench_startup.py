@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de arranque: tiempo de importación de app.main.
+
+Ejecuta varias veces `python -X importtime -c "import app.main"` en procesos
+nuevos, muestra la mediana del tiempo acumulado de app.main, los módulos más
+costosos y comprueba que las dependencias de scraping no se cargan al importar
+la aplicación (se importan en el primer uso).
+
+Uso:
+    python benchmarks/bench_startup.py [--runs 10] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos que no deben cargarse al importar app.main
+LAZY_MODULES = ["app.scraping", "app.storage", "requests", "bs4"]
+
+
+def import_times() -> dict:
+    """
+    Importa app.main en un proceso nuevo y devuelve el tiempo acumulado por módulo (µs).
+    """
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def loaded_lazy_modules() -> list:
+    """
+    Devuelve los módulos de LAZY_MODULES cargados tras importar app.main.
+    """
+    code = (
+        "import sys, app.main; "
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    modules = set().union(*runs)
+    medians = {name: statistics.median(run.get(name, 0) for run in runs) for name in modules}
+
+    print(f"Python {sys.version.split()[0]} | {args.runs} ejecuciones")
+    print(f"app.main (acumulado, mediana): {medians['app.main'] / 1000:.1f} ms")
+    print()
+    print(f"{'módulo':<40} {'ms':>8}")
+    for name in sorted(medians, key=medians.get, reverse=True)[:args.top]:
+        print(f"{name:<40} {medians[name] / 1000:>8.1f}")
+    print()
+    loaded = loaded_lazy_modules()
+    print(f"Módulos diferidos cargados al importar: {', '.join(loaded) if loaded else 'ninguno'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Receptor local de callbacks para probar las búsquedas con callback_url.
+
+Verifica la firma HMAC-SHA256 de cada entrega y muestra el resultado.
+
+Uso:
+    # 1. Iniciar la API con un secreto de firma, permitiendo callbacks a
+    #    localhost, y el receptor con el mismo secreto (WEBHOOK_SECRET o --secret)
+    export WEBHOOK_SECRET=secreto_compartido
+    WEBHOOK_ALLOWED_HOSTS=localhost python run.py
+    python examples/webhook_receiver.py --port 9000
+
+    # 2. Lanzar una búsqueda con callback
+    curl -X POST "http://localhost:8000/search" \\
+      -H "Authorization: Bearer test_token_123" \\
+      -H "Content-Type: application/json" \\
+      -d '{"entity_name": "John Doe", "callback_url": "http://localhost:9000/callback"}'
+
+Con --fail N el receptor responde 503 a las N primeras entregas, para ver los
+reintentos con backoff.
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Tolerancia para rechazar entregas antiguas (protección contra replays)
+MAX_SKEW_SECONDS = 300
+
+
+def verify_signature(body: bytes, timestamp: str, signature: str, secret: str) -> bool:
+    """
+    Comprueba la cabecera X-Webhook-Signature de una entrega.
+
+    Args:
+        body: Cuerpo recibido, sin modificar
+        timestamp: Cabecera X-Webhook-Timestamp
+        signature: Cabecera X-Webhook-Signature ("sha256=<hex>")
+        secret: Secreto compartido con la API
+
+    Returns:
+        bool: True si la firma es válida y la entrega es reciente
+    """
+    try:
+        if abs(time.time() - int(timestamp)) > MAX_SKEW_SECONDS:
+            return False
+    except ValueError:
+        return False
+    expected = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+def make_handler(secret: str, fail_first: int):
+    """
+    Crea el manejador HTTP con la configuración indicada.
+    """
+    state = {"failures_left": fail_first}
+
+    class CallbackHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            delivery_id = self.headers.get("X-Webhook-Id")
+            attempt = self.headers.get("X-Webhook-Attempt")
+
+            if state["failures_left"] > 0:
+                state["failures_left"] -= 1
+                print(f"⚠️  Entrega {delivery_id} (intento {attempt}): respondiendo 503 a propósito")
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            if not verify_signature(body, self.headers.get("X-Webhook-Timestamp", ""),
+                                    self.headers.get("X-Webhook-Signature", ""), secret):
+                print(f"❌ Entrega {delivery_id}: firma inválida")
+                self.send_response(401)
+                self.end_headers()
+                return
+
+            result = json.loads(body)
+            print(f"✅ Entrega {delivery_id} (intento {attempt}) verificada")
+            print(f"   Entidad: {result.get('entity_name')}")
+            print(f"   Coincidencias: {result.get('total_hits')}")
+            print(f"   Fuentes: {', '.join(result.get('sources_searched', []))}")
+
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return CallbackHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receptor local de callbacks")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--secret", default=os.getenv("WEBHOOK_SECRET"),
+                        help="Secreto de firma, el mismo WEBHOOK_SECRET que la API")
+    parser.add_argument("--fail", type=int, default=0, help="Responder 503 a las N primeras entregas")
+    args = parser.parse_args()
+    if not args.secret:
+        parser.error("indica el secreto con --secret o WEBHOOK_SECRET")
+
+    server = HTTPServer(("127.0.0.1", args.port), make_handler(args.secret, args.fail))
+    print(f"📥 Esperando callbacks en http://127.0.0.1:{args.port}/callback")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 ¡Hasta luego!")
+
+
+if __name__ == "__main__":
+    main()
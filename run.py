@@ -1,32 +1,94 @@
 #!/usr/bin/env python3
 """
 Script para ejecutar la API de búsqueda en listas de alto riesgo.
+
+Modos:
+    development (por defecto): un proceso con recarga automática.
+    production: varios workers (uno por CPU), uvloop + httptools y sin recarga.
+
+El modo se elige con --mode o con la variable de entorno ENVIRONMENT.
 """
 
+import argparse
 import uvicorn
 import os
-from dotenv import load_dotenv
 
-# Cargar variables de entorno
-load_dotenv()
+from app.config import get_settings
+
+MODES = ("development", "production")
+
+
+def parse_args():
+    """
+    Lee la configuración del servidor desde la línea de comandos.
+    Los valores por defecto se toman de la configuración (variables de entorno / .env).
+    """
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="API de Búsqueda en Listas de Alto Riesgo")
+    parser.add_argument("--mode", type=str.lower, choices=MODES,
+                        default=settings.environment,
+                        help="Modo de ejecución (ENVIRONMENT)")
+    parser.add_argument("--host", default=settings.host,
+                        help="Dirección de escucha (HOST)")
+    parser.add_argument("--port", type=int, default=settings.port,
+                        help="Puerto de escucha (PORT)")
+    parser.add_argument("--workers", type=int, default=settings.workers,
+                        help="Procesos worker en producción (WORKERS, 0 = uno por CPU)")
+    parser.add_argument("--keep-alive", type=int, default=settings.keep_alive_timeout,
+                        help="Segundos que se mantiene abierta una conexión inactiva (KEEP_ALIVE_TIMEOUT)")
+    parser.add_argument("--backlog", type=int, default=settings.backlog,
+                        help="Conexiones pendientes máximas en el socket (BACKLOG)")
+    parser.add_argument("--graceful-timeout", type=int, default=settings.graceful_shutdown_timeout,
+                        help="Segundos de espera a peticiones en curso al detener (GRACEFUL_SHUTDOWN_TIMEOUT)")
+    parser.add_argument("--log-level", type=str.lower, default=settings.log_level.lower(),
+                        choices=["critical", "error", "warning", "info", "debug"],
+                        help="Nivel de log de uvicorn (LOG_LEVEL)")
+    args = parser.parse_args()
+    # argparse no comprueba el valor por defecto contra choices: un ENVIRONMENT
+    # mal escrito arrancaría en desarrollo, con recarga automática
+    if args.mode not in MODES:
+        parser.error(f"ENVIRONMENT inválido: {args.mode!r}. Valores válidos: {', '.join(MODES)}")
+    return args
+
 
 if __name__ == "__main__":
     # Configuración del servidor
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", 8000))
-    
+    args = parse_args()
+    host = args.host
+    port = args.port
+    production = args.mode == "production"
+
     print(f"🚀 Iniciando API de Búsqueda en Listas de Alto Riesgo")
     print(f"📍 Servidor: http://{host}:{port}")
     print(f"📚 Documentación: http://{host}:{port}/docs")
     print(f"🔍 Health check: http://{host}:{port}/health")
     print(f"⏹️  Para detener: Ctrl+C")
     print("-" * 50)
-    
-    # Ejecutar el servidor
-    uvicorn.run(
-        "app.main:app",
-        host=host,
-        port=port,
-        reload=True,  # Recargar automáticamente en desarrollo
-        log_level="info"
-    ) 
\ No newline at end of file
+
+    if production:
+        workers = args.workers or os.cpu_count() or 1
+        print(f"🏭 Modo producción: {workers} workers, uvloop + httptools")
+
+        # Ejecutar el servidor en modo producción
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            workers=workers,
+            loop="uvloop",
+            http="httptools",
+            reload=False,
+            timeout_keep_alive=args.keep_alive,
+            backlog=args.backlog,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            log_level=args.log_level
+        )
+    else:
+        # Ejecutar el servidor
+        uvicorn.run(
+            "app.main:app",
+            host=host,
+            port=port,
+            reload=True,  # Recargar automáticamente en desarrollo
+            log_level=args.log_level
+        )
@@ -0,0 +1,16 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import storage, watchlist
+from app.main import app
+from app.rate_limit import limiter
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    # Sin eventos de arranque (watchlist) y con almacenes temporales
+    monkeypatch.setattr(storage, "_store", storage.ResultStore(str(tmp_path / "results.db")))
+    monkeypatch.setattr(watchlist, "_store", watchlist.WatchlistStore(str(tmp_path / "results.db")))
+    limiter.reset()
+    yield TestClient(app)
+    limiter.reset()
@@ -0,0 +1,78 @@
+"""
+Peticiones duplicadas (hedged_submit) y tokens de resultados pendientes.
+"""
+
+import logging
+import time
+from concurrent.futures import Executor, Future
+
+import pytest
+
+from app import hedging, storage
+from app.config import get_settings
+from app.models import EntityResult
+from app.scraping import get_pending_results
+from app.sources import get_source
+
+
+class ManualExecutor(Executor):
+    """
+    Executor que no ejecuta nada: el test completa los intentos a mano.
+    """
+
+    def __init__(self):
+        self.attempts = []
+
+    def submit(self, fn, *args, **kwargs):
+        attempt = Future()
+        self.attempts.append(attempt)
+        return attempt
+
+
+def test_attempt_finishing_while_winner_resolves(monkeypatch, caplog):
+    executor = ManualExecutor()
+
+    class InterleavedFuture(Future):
+        # El segundo intento termina mientras el primero fija el resultado
+        def set_result(self, value):
+            executor.attempts[1].set_result("copia")
+            super().set_result(value)
+
+    monkeypatch.setattr(hedging, "Future", InterleavedFuture)
+    future = hedging.hedged_submit(executor, lambda: None, hedge_after=0)
+    deadline = time.monotonic() + 5
+    while len(executor.attempts) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    with caplog.at_level(logging.ERROR, logger="concurrent.futures"):
+        executor.attempts[0].set_result("original")
+
+    assert future.result(timeout=1) == "original"
+    assert not caplog.records
+
+
+def test_pending_token_is_an_opaque_reference(monkeypatch):
+    store = storage.ResultStore(":memory:")
+    secret = get_settings().api_token
+    reference = store.save_pending("John Doe", ["ofac", "world_bank"], issued_at=time.time() - 1)
+    token = hedging.make_pending_token(reference, secret)
+
+    assert "john" not in token.lower()
+    assert hedging.read_pending_token(token, secret) == reference
+
+    store.save_search("john  doe", "ofac", [EntityResult(name="John Doe", source=get_source("ofac").name)])
+    result = get_pending_results(token, store)
+    assert result.entity_name == "John Doe"
+    assert result.sources_searched == ["OFAC Sanctions"]
+    assert result.pending_sources == ["World Bank Debarred Firms"]
+    assert result.pending_token == token
+
+    with pytest.raises(ValueError, match="inválido"):
+        get_pending_results(token[:-1] + ("0" if token[-1] != "0" else "1"), store)
+    with pytest.raises(ValueError, match="caducado"):
+        get_pending_results(hedging.make_pending_token("desconocida", secret), store)
+
+    # Pasado el TTL la referencia deja de resolverse
+    expired = time.time() + storage.PENDING_SEARCH_TTL + 10
+    monkeypatch.setattr(storage.time, "time", lambda: expired)
+    assert store.get_pending(reference) is None
@@ -0,0 +1,24 @@
+"""
+Endpoints de histórico: filtro por fuente.
+"""
+
+from app import storage
+from app.config import get_settings
+from app.models import EntityResult
+
+HEADERS = {"Authorization": f"Bearer {get_settings().api_token}"}
+
+
+def test_history_endpoints_filter_by_source_id(client):
+    store = storage.get_result_store()
+    store.save_search("Acme", "ofac", [EntityResult(name="Acme Trading", source="OFAC Sanctions")])
+    store.save_search("Acme", "world_bank", [EntityResult(name="Acme Works", source="World Bank Debarred Firms")])
+
+    history = client.get("/history", params={"source": "ofac"}, headers=HEADERS).json()
+    assert [entry["source"] for entry in history["entries"]] == ["ofac"]
+
+    found = client.get("/history/search", params={"q": "acme", "source": "ofac"}, headers=HEADERS).json()
+    assert [result["name"] for result in found["results"]] == ["Acme Trading"]
+
+    response = client.get("/history/search", params={"q": "acme", "source": "OFAC Sanctions"}, headers=HEADERS)
+    assert response.status_code == 400
@@ -0,0 +1,75 @@
+"""
+Cabeceras de caché y ETag de GET /search y respuesta 429.
+"""
+
+import dataclasses
+
+import requests
+
+from app import rate_limit
+from app.config import get_settings
+from app.sources import get_source
+
+HEADERS = {"Authorization": f"Bearer {get_settings().api_token}"}
+
+
+def test_failed_source_is_not_cached(client, monkeypatch):
+    def unavailable(session, entity_name):
+        raise requests.ConnectionError("sin conexión")
+
+    monkeypatch.setattr(get_source("ofac"), "fetch", unavailable)
+    monkeypatch.setattr(get_source("ofac"), "fetch_stream", None)
+    response = client.get("/search", params={"entity_name": "Acme", "source": "ofac"}, headers=HEADERS)
+
+    assert response.status_code == 200
+    assert response.json()["failed_sources"] == ["OFAC Sanctions"]
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_search_etag_is_weak_and_revalidates(client, monkeypatch):
+    monkeypatch.setattr(get_source("ofac"), "fetch", lambda session, entity_name: (b"<html></html>", None))
+    monkeypatch.setattr(get_source("ofac"), "fetch_stream", None)
+    params = {"entity_name": "Acme", "source": "ofac"}
+
+    first = client.get("/search", params=params, headers=HEADERS)
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    # Otra búsqueda con otro timestamp y sin comprimir: mismo ETag débil
+    second = client.get("/search", params=params, headers={**HEADERS, "Accept-Encoding": "identity"})
+    assert second.headers["ETag"] == etag
+    assert second.json()["timestamp"] != first.json()["timestamp"]
+
+    for if_none_match in (etag, etag.removeprefix("W/"), f'"other", {etag}'):
+        response = client.get("/search", params=params, headers={**HEADERS, "If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+
+
+def test_rate_limit_returns_429(client, monkeypatch):
+    monkeypatch.setattr(get_source("ofac"), "fetch", lambda session, entity_name: (b"<html></html>", None))
+    monkeypatch.setattr(get_source("ofac"), "fetch_stream", None)
+    for _ in range(20):
+        response = client.get("/search", params={"entity_name": "Acme", "source": "ofac"}, headers=HEADERS)
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"].startswith("public")
+
+    response = client.get("/search", params={"entity_name": "Acme", "source": "ofac"}, headers=HEADERS)
+
+    assert response.status_code == 429
+    assert response.json()["error"] == "Rate limit exceeded"
+    assert int(response.headers["Retry-After"]) > 0
+
+
+def test_rate_limit_uses_max_requests_per_minute(client, monkeypatch):
+    settings = dataclasses.replace(get_settings(), max_requests_per_minute=2)
+    monkeypatch.setattr(rate_limit, "get_settings", lambda: settings)
+    monkeypatch.setattr(get_source("ofac"), "fetch", lambda session, entity_name: (b"<html></html>", None))
+    monkeypatch.setattr(get_source("ofac"), "fetch_stream", None)
+    params = {"entity_name": "Acme", "source": "ofac"}
+
+    assert [client.get("/search", params=params, headers=HEADERS).status_code for _ in range(3)] == [200, 200, 429]
+    assert client.get("/search", params=params, headers=HEADERS).json()["detail"] == (
+        "Has excedido el límite de 2 llamadas por minuto"
+    )
+    assert rate_limit.get_rate_limit_info()["max_requests_per_minute"] == 2
@@ -0,0 +1,31 @@
+"""
+Los logs no deben contener los nombres buscados.
+"""
+
+import logging
+
+import requests
+
+from app.logging_config import AccessLogFilter, describe_error
+
+
+def test_describe_error_omits_url():
+    response = requests.Response()
+    response.status_code = 503
+    error = requests.HTTPError("503 Server Error for url: https://x/search?name=John+Doe", response=response)
+
+    assert describe_error(error) == "HTTPError 503"
+    assert describe_error(requests.ConnectionError("url: /search?q=John+Doe")) == "ConnectionError"
+
+
+def test_access_log_redacts_query_and_pending_token():
+    def access_line(path):
+        record = logging.LogRecord("uvicorn.access", logging.INFO, "", 0, '%s - "%s %s HTTP/%s" %d',
+                                   ("127.0.0.1:5000", "GET", path, "1.1", 200), None)
+        AccessLogFilter().filter(record)
+        return record.getMessage()
+
+    assert access_line("/search?entity_name=John+Doe&source=all") == \
+        '127.0.0.1:5000 - "GET /search?entity_name=***&source=*** HTTP/1.1" 200'
+    assert "John" not in access_line("/search/pending/eyJlbnRpdHlfbmFtZSI6IkpvaG4ifQ.abc")
+    assert access_line("/health") == '127.0.0.1:5000 - "GET /health HTTP/1.1" 200'
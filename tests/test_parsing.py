@@ -0,0 +1,33 @@
+"""
+Executor de parseo: recuperación del pool de procesos.
+"""
+
+import os
+
+import pytest
+
+from app import parsing
+from app.sources import get_source
+
+PAGE = b'<table><tr class="debarred-firm"><td>Acme</td><td>a</td><td>ES</td><td>2020</td></tr></table>'
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    monkeypatch.setattr(parsing, "_create_configured_executor", lambda: parsing.create_executor("process", 1))
+    monkeypatch.setattr(parsing, "_executor", parsing.create_executor("process", 1))
+    monkeypatch.setattr(parsing, "_executor_created", True)
+    yield
+    parsing.shutdown_parse_executor()
+
+
+def test_broken_process_pool_is_replaced(process_pool):
+    plugin = get_source("world_bank")
+    broken = parsing.get_parse_executor()
+    # Matar el proceso worker deja el pool en BrokenProcessPool
+    with pytest.raises(parsing.BrokenProcessPool):
+        broken.submit(os._exit, 1).result()
+
+    assert [result.name for result in parsing.parse_content(plugin, PAGE)] == ["Acme"]
+    assert parsing.get_parse_executor() is not broken
+    assert [result.name for result in parsing.parse_content(plugin, PAGE)] == ["Acme"]
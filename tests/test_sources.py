@@ -0,0 +1,42 @@
+"""
+Selección de fuentes a partir del campo source de las peticiones.
+"""
+
+import pytest
+
+from app.sources import available_sources, resolve_sources
+
+
+def ids(plugins):
+    return [plugin.id for plugin in plugins]
+
+
+def test_all_and_none_select_every_source():
+    every = ids(available_sources())
+    assert every == ["offshore_leaks", "world_bank", "ofac"]
+    assert ids(resolve_sources("all")) == every
+    assert ids(resolve_sources(None)) == every
+    assert ids(resolve_sources(["ofac", "all"])) == every
+
+
+def test_lists_and_commas_are_sorted_by_priority():
+    assert ids(resolve_sources("ofac")) == ["ofac"]
+    assert ids(resolve_sources(["ofac", "world_bank"])) == ["world_bank", "ofac"]
+    assert ids(resolve_sources(" ofac , offshore_leaks ,")) == ["offshore_leaks", "ofac"]
+
+
+def test_duplicates_are_removed():
+    assert ids(resolve_sources("ofac,ofac, ofac")) == ["ofac"]
+    assert ids(resolve_sources(["world_bank", "ofac", "world_bank"])) == ["world_bank", "ofac"]
+
+
+@pytest.mark.parametrize("source", ["", " , ", []])
+def test_empty_selection_is_rejected(source):
+    with pytest.raises(ValueError, match="al menos una fuente"):
+        resolve_sources(source)
+
+
+def test_invalid_ids_are_reported():
+    with pytest.raises(ValueError, match="Fuente inválida: OFAC Sanctions, foo") as excinfo:
+        resolve_sources(["ofac", "OFAC Sanctions", "foo"])
+    assert "Fuentes válidas:" in str(excinfo.value)
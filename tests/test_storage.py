@@ -0,0 +1,76 @@
+"""
+Almacén local de resultados (SQLite + FTS5).
+"""
+
+import pytest
+
+from app.models import EntityResult
+from app.storage import ResultStore
+
+
+def ofac(name, **fields):
+    return EntityResult(name=name, source="OFAC Sanctions", **fields)
+
+
+@pytest.fixture
+def store():
+    return ResultStore(":memory:")
+
+
+def test_upsert_keeps_one_entity_per_result(store):
+    store.save_search("Acme", "ofac", [ofac("Acme Ltd", url="https://a/1")], searched_at=100)
+    store.save_search("acme", "ofac", [ofac("Acme Ltd", url="https://a/2")], searched_at=200)
+
+    rows = store._conn.execute("SELECT url, first_seen, last_seen FROM entities").fetchall()
+    assert [tuple(row) for row in rows] == [("https://a/2", 100, 200)]
+    # Cada scraping queda en el histórico, aunque la entidad sea la misma
+    assert [entry["searched_at"] for entry in store.history(entity_name="ACME")] == [200, 100]
+
+
+def test_search_text_uses_full_text_index(store):
+    store.save_search("Acme", "ofac", [ofac("Acme Ltd", address="Caracas, Venezuela", programs="VENEZUELA")])
+    store.save_search("Acme", "world_bank", [
+        EntityResult(name="Acme Works", source="World Bank Debarred Firms", country="Venezuela"),
+    ])
+
+    assert {result.name for result in store.search_text("venezuela")} == {"Acme Ltd", "Acme Works"}
+    assert [result.name for result in store.search_text("venezuela", source_names=["OFAC Sanctions"])] == ["Acme Ltd"]
+    assert [result.name for result in store.search_text("caracas")] == ["Acme Ltd"]
+    # Las comillas y operadores del usuario no rompen la consulta FTS5
+    assert store.search_text('acme" OR "x') == []
+    assert store.search_text("   ") == []
+
+
+def test_get_fresh(store, monkeypatch):
+    monkeypatch.setattr("app.storage.time.time", lambda: 1000)
+    assert store.get_fresh("Acme", "ofac", max_age=60) is None
+
+    store.save_search("Acme", "ofac", [ofac("Acme Ltd")], searched_at=950)
+    store.save_search("Other", "ofac", [], searched_at=990)
+
+    assert [result.name for result in store.get_fresh("  ACME ", "ofac", max_age=60)] == ["Acme Ltd"]
+    assert store.get_fresh("Acme", "ofac", max_age=10) is None
+    assert store.get_fresh("Acme", "world_bank", max_age=60) is None
+    # Una búsqueda sin coincidencias es un resultado válido, no "sin datos"
+    assert store.get_fresh("Other", "ofac", max_age=60) == []
+
+
+def test_failures_are_not_searches(store):
+    store.save_failure("Acme", "ofac", failed_at=500)
+
+    assert store.history(entity_name="Acme") == []
+    assert store.get_fresh("Acme", "ofac", max_age=10 ** 9) is None
+    assert store.failed_since("acme", "ofac", since=400)
+    assert not store.failed_since("Acme", "ofac", since=600)
+    assert not store.failed_since("Acme", "world_bank", since=400)
+
+
+def test_history_filters(store):
+    store.save_search("Acme", "ofac", [ofac("Acme Ltd")], searched_at=100)
+    store.save_search("Acme", "world_bank", [], searched_at=200)
+    store.save_search("Other", "ofac", [], searched_at=300)
+
+    assert [(e["entity_name"], e["source"]) for e in store.history(source="ofac")] == [("Other", "ofac"), ("Acme", "ofac")]
+    assert [e["source"] for e in store.history(entity_name="acme", since=150)] == ["world_bank"]
+    assert [e["searched_at"] for e in store.history(until=250, limit=1)] == [200]
+    assert store.history(entity_name="Acme", source="ofac")[0]["results"][0].name == "Acme Ltd"
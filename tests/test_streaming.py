@@ -0,0 +1,112 @@
+"""
+Paridad entre el parseo completo (parse, BeautifulSoup) y el incremental
+(iter_rows + from_row) de cada fuente.
+"""
+
+import pytest
+
+from app.sources import get_source
+from app.streaming import decode_chunks, iter_rows
+
+PAGES = {
+    "ofac": [
+        # Bien formada, con entidades, etiquetas vacías y campos ausentes
+        "<html><body>" + "".join(
+            f'<div class="x sanctioned-entity"><span class="entity-name"> ACME &amp; Co {i} <b>Ltd</b></span>'
+            f'<br><span class="programs">SDGT</span><img src=a><span class="score">{i}</span></div>'
+            for i in range(20)
+        ) + '<div class="sanctioned-entity"><span class="entity-name"></span></div>'
+        '<div class="sanctioned-entity"></div></body></html>',
+        # Sin cierres opcionales
+        '<div class="sanctioned-entity"><p>nota<span class="entity-name">A</span></div>'
+        '<div class="sanctioned-entity"><span class="entity-name">B</span><p>otra</div>',
+    ],
+    "offshore_leaks": [
+        "".join(
+            f'<div class="search-result"><h3 class="entity-name">E{i}</h3><div><span class="jurisdiction">PA</span>'
+            f'</div><span class="data-from">Panama</span><span class="data-from">X</span></div>'
+            for i in range(20)
+        ),
+        # <p> sin cerrar dentro del resultado
+        '<div class="search-result"><p>intro<h3 class="entity-name">E1</h3></div>'
+        '<div class="search-result"><h3 class="entity-name">E2</h3><p>fin</div>',
+    ],
+    "world_bank": [
+        "<table>" + "".join(
+            f'<tr class="debarred-firm"><td>F{i}</td><td>Addr</td><td>ES</td><td>2020</td>'
+            + ("<td>2030</td><td>Fraud</td>" if i % 2 else "") + "</tr>"
+            for i in range(20)
+        ) + '<tr class="debarred-firm"><td>x</td></tr></table>',
+        # Celdas sin cerrar, y una fila que se cierra con </table>
+        '<table><tr class="debarred-firm"><td>X<td>a<td>b<td>c</tr>'
+        '<tr class="debarred-firm"><td>Y<td>a<td>b<td>c<td>d</table>',
+        # Fila sin cerrar al final del documento
+        '<table><tr class="debarred-firm"><td>Z</td><td>a</td><td>b</td><td>c</td>',
+    ],
+}
+
+CASES = [(source_id, index) for source_id, pages in PAGES.items() for index in range(len(pages))]
+
+
+def stream_results(plugin, html: str, chunk_size: int):
+    chunks = (html[i:i + chunk_size] for i in range(0, len(html), chunk_size))
+    results = (plugin.from_row(values) for values in iter_rows(plugin.rows, chunks))
+    return [result.model_dump() for result in results if result is not None]
+
+
+@pytest.mark.parametrize("source_id,index", CASES)
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_stream_matches_parse(source_id, index, chunk_size):
+    plugin = get_source(source_id)
+    html = PAGES[source_id][index]
+
+    expected = [result.model_dump() for result in plugin.parse(html)]
+
+    assert expected
+    assert stream_results(plugin, html, chunk_size) == expected
+
+
+@pytest.mark.parametrize("mode", ["inline", "process"])
+def test_parse_uses_declared_charset(mode, monkeypatch):
+    from app import parsing
+
+    plugin = get_source("world_bank")
+    page = '<table><tr class="debarred-firm"><td>Сергей Иванов</td><td>Москва</td><td>RU</td><td>2020</td></tr></table>'
+    executor = parsing.create_executor(mode, 1)
+    monkeypatch.setattr(parsing, "get_parse_executor", lambda: executor)
+    try:
+        results = parsing.parse_content(plugin, page.encode("cp1251"), "windows-1251")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    assert [result.name for result in results] == ["Сергей Иванов"]
+
+
+CYRILLIC_ROW = '<tr class="debarred-firm"><td>Сергей Иванов</td><td>Москва</td><td>RU</td><td>2020</td></tr>'
+
+
+@pytest.mark.parametrize("page,encoding", [
+    ('<html><head><meta charset="windows-1251"></head><body><table>' + CYRILLIC_ROW + "</table>", "cp1251"),
+    ('<meta http-equiv="Content-Type" content="text/html; charset=koi8-r"><table>' + CYRILLIC_ROW + "</table>", "koi8-r"),
+    ("\ufeff<table>" + CYRILLIC_ROW + "</table>", "utf-16-le"),
+    ("<table>" + CYRILLIC_ROW + "</table>", "utf-8"),
+])
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_stream_detects_undeclared_charset(page, encoding, chunk_size):
+    # Sin charset en Content-Type: ambos modos detectan BOM y <meta charset>
+    plugin = get_source("world_bank")
+    content = page.encode(encoding)
+    chunks = (content[i:i + chunk_size] for i in range(0, len(content), chunk_size))
+    results = (plugin.from_row(values) for values in iter_rows(plugin.rows, decode_chunks(chunks)))
+
+    expected = [result.model_dump() for result in plugin.parse(content)]
+
+    assert [result["name"] for result in expected] == ["Сергей Иванов"]
+    assert [result.model_dump() for result in results if result is not None] == expected
+
+
+def test_declared_charset_takes_precedence_over_meta():
+    content = '<meta charset="utf-8"><p>Москва</p>'.encode("cp1251")
+
+    assert "".join(decode_chunks([content], "windows-1251")) == '<meta charset="utf-8"><p>Москва</p>'
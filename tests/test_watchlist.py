@@ -0,0 +1,117 @@
+"""
+Lista de vigilancia: huella, diff de coincidencias y reintentos.
+"""
+
+import pytest
+
+from app import scraping
+from app.models import EntityResult, SearchResponse
+from app.sources import get_source
+from app.watchlist import WatchlistScheduler, WatchlistStore, fingerprint
+
+
+def hit(name, source_id="ofac"):
+    return EntityResult(name=name, source=get_source(source_id).name)
+
+
+@pytest.fixture
+def store():
+    return WatchlistStore(":memory:")
+
+
+def test_fingerprint_ignores_order():
+    a, b = hit("Acme Ltd"), hit("Acme Bank", "world_bank")
+
+    assert fingerprint([a, b]) == fingerprint([b, a])
+    assert fingerprint([a]) != fingerprint([a, b])
+    assert fingerprint([]) != fingerprint([a])
+
+
+def test_record_screening_diffs_against_baseline(store):
+    entry = store.add("Acme", ["ofac", "world_bank"])
+    first, second, third = hit("Acme Ltd"), hit("Acme Bank", "world_bank"), hit("Acme Corp")
+
+    # El primer screening fija la línea base sin generar cambio
+    (claimed,) = store.claim_due(0, 10)
+    assert store.record_screening(claimed, [first, second]) is None
+
+    # Mismas coincidencias en otro orden: sin cambio
+    (claimed,) = store.claim_due(0, 10)
+    assert store.record_screening(claimed, [second, first]) is None
+    assert store.changes() == []
+
+    (claimed,) = store.claim_due(0, 10)
+    change = store.record_screening(claimed, [first, third])
+    assert [item["name"] for item in change["added"]] == ["Acme Corp"]
+    assert [item["name"] for item in change["removed"]] == ["Acme Bank"]
+
+    (saved,) = store.changes(entity_name=" acme ")
+    assert saved["id"] == change["id"]
+    assert saved["watch_id"] == entry["id"]
+    assert saved["added"] == change["added"] and saved["removed"] == change["removed"]
+    assert store.changes(entity_name="Other") == []
+
+    # La nueva referencia es el último screening
+    (claimed,) = store.claim_due(0, 10)
+    assert store.record_screening(claimed, [third, first]) is None
+
+
+class FakeSearch:
+    """
+    Sustituye a search_entity: cada fuente devuelve sus resultados o falla.
+    """
+
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    def __call__(self, entity_name, sources, store=None):
+        self.calls.append(list(sources))
+        failed = [get_source(s).name for s in sources if self.results[s] is None]
+        found = [r for s in sources if self.results[s] is not None for r in self.results[s]]
+        return SearchResponse(entity_name=entity_name, total_hits=len(found), search_time=0,
+                              sources_searched=[get_source(s).name for s in sources
+                                                if self.results[s] is not None],
+                              failed_sources=failed, results=found)
+
+
+def expire_claim(store, watch_id):
+    with store._conn:
+        store._conn.execute("UPDATE watchlist SET claimed_until = 0 WHERE id = ?", (watch_id,))
+
+
+def test_failed_source_is_retried_alone_after_backoff(store, monkeypatch):
+    search = FakeSearch({"ofac": None, "world_bank": [hit("Acme Bank", "world_bank")]})
+    monkeypatch.setattr(scraping, "search_entity", search)
+    entry = store.add("Acme", ["ofac", "world_bank"])
+    scheduler = WatchlistScheduler(store, None, interval=86400, retry_delay=300)
+
+    # Primer intento: OFAC falla y el screening se aplaza
+    assert scheduler.run_once() == []
+    assert store.entries()[0]["last_checked"] is None
+
+    # Los ciclos siguientes no lo reclaman hasta que pasa el retraso
+    scheduler.run_once()
+    scheduler.run_once()
+    assert search.calls == [["ofac", "world_bank"]]
+
+    # El reintento sólo consulta la fuente que falló; OFAC sigue caída
+    expire_claim(store, entry["id"])
+    scheduler.run_once()
+    assert search.calls[-1] == ["ofac"]
+    assert store.claim_due(86400, 10) == []
+
+    # Al recuperarse, se completa con los resultados guardados del World Bank
+    search.results["ofac"] = [hit("Acme Ltd")]
+    expire_claim(store, entry["id"])
+    scheduler.run_once()
+    assert search.calls[-1] == ["ofac"]
+    saved = store.entries()[0]
+    assert saved["last_checked"] is not None
+    assert saved["total_hits"] == 2
+
+
+def test_retry_delay_doubles_up_to_interval():
+    scheduler = WatchlistScheduler(None, None, interval=3600, retry_delay=300)
+
+    assert [scheduler.retry_after(n) for n in range(1, 6)] == [300, 600, 1200, 2400, 3600]
@@ -0,0 +1,113 @@
+"""
+Validación de las URL de callback (SSRF).
+"""
+
+import dataclasses
+import socket
+import threading
+import time
+
+import pytest
+
+from app import main, webhooks
+from app.config import get_settings
+from app.models import EntityResult
+from app.webhooks import check_callback_url
+
+HEADERS = {"Authorization": f"Bearer {get_settings().api_token}"}
+
+
+def resolves_to(monkeypatch, address):
+    def getaddrinfo(host, port, *args, **kwargs):
+        return [(socket.AF_INET6 if ":" in address else socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, port))]
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1:9000/callback",
+    "http://169.254.169.254/latest/meta-data/",
+    "http://10.0.0.5/",
+    "http://192.168.1.1/",
+    "http://[::1]/",
+    "http://[::ffff:127.0.0.1]/",
+    "http://0.0.0.0/",
+    "ftp://example.com/",
+    "http:///sin-host",
+])
+def test_rejects_internal_destinations(url):
+    with pytest.raises(ValueError):
+        check_callback_url(url, resolve=False)
+
+
+def test_rejects_hostname_resolving_to_private_address(monkeypatch):
+    resolves_to(monkeypatch, "10.1.2.3")
+
+    assert check_callback_url("https://interno.example.com/cb", resolve=False)
+    with pytest.raises(ValueError):
+        check_callback_url("https://interno.example.com/cb")
+
+
+def test_accepts_public_destination(monkeypatch):
+    resolves_to(monkeypatch, "93.184.216.34")
+
+    assert check_callback_url("https://example.com/cb") == "https://example.com/cb"
+
+
+def test_allowed_hosts(monkeypatch):
+    settings = dataclasses.replace(get_settings(), webhook_allowed_hosts=("localhost",))
+    monkeypatch.setattr(webhooks, "get_settings", lambda: settings)
+    resolves_to(monkeypatch, "93.184.216.34")
+
+    assert check_callback_url("http://localhost:9000/callback")
+    with pytest.raises(ValueError):
+        check_callback_url("https://example.com/cb")
+
+
+def with_webhook_secret(monkeypatch, secret):
+    settings = dataclasses.replace(get_settings(), webhook_secret=secret)
+    monkeypatch.setattr(main, "get_settings", lambda: settings)
+    monkeypatch.setattr(webhooks, "get_settings", lambda: settings)
+
+
+def test_endpoints_reject_internal_callback(client, monkeypatch):
+    with_webhook_secret(monkeypatch, "secreto")
+    resolves_to(monkeypatch, "127.0.0.1")
+
+    metadata = {"entity_name": "Acme", "callback_url": "http://169.254.169.254/latest/meta-data/"}
+    assert client.post("/search", json=metadata, headers=HEADERS).status_code == 422
+    assert client.post("/watchlist", json=metadata, headers=HEADERS).status_code == 422
+
+    local = {"entity_name": "Acme", "callback_url": "http://receptor.example.com:9000/callback"}
+    assert client.post("/search", json=local, headers=HEADERS).status_code == 400
+    assert client.post("/watchlist", json=local, headers=HEADERS).status_code == 400
+
+
+def test_callbacks_require_webhook_secret(client, monkeypatch):
+    with_webhook_secret(monkeypatch, "")
+    resolves_to(monkeypatch, "93.184.216.34")
+
+    request = {"entity_name": "Acme", "callback_url": "https://example.com/cb"}
+    assert client.post("/search", json=request, headers=HEADERS).status_code == 503
+    assert client.post("/watchlist", json=request, headers=HEADERS).status_code == 503
+    with pytest.raises(webhooks.WebhookSecretMissing):
+        webhooks.get_dispatcher()
+
+
+def test_stop_cancels_queued_searches_within_timeout():
+    dispatcher = webhooks.WebhookDispatcher("secreto", max_pending=20, job_workers=1)
+    release = threading.Event()
+    for i in range(10):
+        assert dispatcher.try_reserve()
+        dispatcher.submit_job(f"job-{i}", "https://example.com/cb", lambda: release.wait(10) and EntityResult(name="Acme", source="OFAC Sanctions"))
+
+    start = time.monotonic()
+    dispatcher.stop(timeout=0.5)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    assert elapsed < 2
+    # Los 9 trabajos sin empezar liberaron su hueco; el que estaba en curso no
+    free = 0
+    while dispatcher.try_reserve():
+        free += 1
+    assert free == 19